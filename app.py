@@ -3,21 +3,37 @@
 GKE Resource Optimizer Slack Agent
 
 Main application entry point.
+
+Run with Gunicorn's gevent worker so slow downstream calls (Gemini, Jira,
+GKE) don't block other Slack requests:
+
+    gunicorn -w 1 -k gevent --worker-connections 100 app:flask_app
 """
 
+# Patch blocking I/O for gevent before anything else is imported
+from gevent import monkey
+monkey.patch_all()
+
+import grpc.experimental.gevent as grpc_gevent
+grpc_gevent.init_gevent()
+
 import os
+import ssl
 import logging
 from dotenv import load_dotenv
-from flask import Flask
+from flask import Flask, request
 from slack_bolt import App
 from slack_bolt.adapter.flask import SlackRequestHandler
+from slack_sdk import WebClient
+
+# Load environment variables before the services read their configuration
+load_dotenv()
 
 # Import handlers
 from handlers.slack_commands import register_slack_commands
 from handlers.slack_interactions import register_slack_interactions
-
-# Load environment variables
-load_dotenv()
+from services import jira_queue, slack_notifier
+from services.k8s import start_informer
 
 # Configure logging
 logging.basicConfig(
@@ -27,9 +43,15 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Initialize the Slack app
-slack_app = App(
+# Initialize the Slack app. Bolt derives the per-request `client` from this
+# WebClient, so sharing one SSL context avoids reloading the CA bundle for
+# every Slack API call.
+slack_client = WebClient(
     token=os.environ.get("SLACK_BOT_TOKEN"),
+    ssl=ssl.create_default_context()
+)
+slack_app = App(
+    client=slack_client,
     signing_secret=os.environ.get("SLACK_SIGNING_SECRET")
 )
 
@@ -41,17 +63,35 @@ handler = SlackRequestHandler(slack_app)
 register_slack_commands(slack_app)
 register_slack_interactions(slack_app)
 
+# Keep a watch-driven copy of cluster deployments so workload reads don't hit
+# the API server
+if os.environ.get("K8S_INFORMER_ENABLED", "true").lower() == "true":
+    start_informer()
+
 @flask_app.route("/slack/events", methods=["POST"])
 def slack_events():
     """Handle Slack events and commands"""
     return handler.handle(request)
 
+# Precomputed so frequent liveness/readiness probes skip JSON serialization
+_HEALTH_RESPONSE = (b'{"status":"healthy"}', 200, {"Content-Type": "application/json"})
+
 @flask_app.route("/health", methods=["GET"])
 def health_check():
     """Health check endpoint"""
-    return {"status": "healthy"}
+    return _HEALTH_RESPONSE
+
+@flask_app.route("/metrics", methods=["GET"])
+def metrics():
+    """Background queue metrics endpoint"""
+    return {
+        "jira_queue_depth": jira_queue.depth(),
+        "slack_queue_depth": slack_notifier.depth()
+    }
 
 if __name__ == "__main__":
+    from gevent.pywsgi import WSGIServer
+
     logger.info("Starting GKE Resource Optimizer Slack Agent")
     port = int(os.environ.get("PORT", 3000))
-    flask_app.run(host="0.0.0.0", port=port) 
\ No newline at end of file
+    WSGIServer(("0.0.0.0", port), flask_app).serve_forever() 
\ No newline at end of file
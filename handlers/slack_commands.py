@@ -12,10 +12,11 @@ from slack_bolt import App
 from services.nlu import process_natural_language
 from services.k8s import get_resource_usage
 from services.recommender import suggest_optimization_candidates
+from services import ratelimit
 from views.slack_blocks import (
-    build_optimization_request_blocks, 
-    build_resource_usage_blocks,
-    build_workload_suggestion_blocks
+    build_optimization_request_blocks_json,
+    build_resource_usage_blocks_json,
+    build_workload_suggestion_blocks_json
 )
 
 logger = logging.getLogger(__name__)
@@ -34,6 +35,11 @@ def handle_optimize_resources(ack, command, client, logger):
     It accepts natural language input like:
     "/optimize-resources Reduce memory for my-app"
     """
+    # Reject bursts before doing any expensive work
+    if not ratelimit.allow(command["user_id"]):
+        ack("You're sending optimization requests too quickly. Please wait a moment and try again.")
+        return
+    
     # Acknowledge the command request immediately
     ack()
     
@@ -53,7 +59,7 @@ def handle_optimize_resources(ack, command, client, logger):
             intent, entities = None, {}
         
         # Build the interactive message blocks
-        blocks = build_optimization_request_blocks(intent, entities)
+        blocks = build_optimization_request_blocks_json(intent, entities)
         
         # Send the response message
         client.chat_postMessage(
@@ -104,7 +110,7 @@ def handle_resource_usage(ack, command, client, logger):
         usage_data = get_resource_usage(namespace, workload_name)
         
         # Build the resource usage message blocks
-        blocks = build_resource_usage_blocks(namespace, workload_name, usage_data)
+        blocks = build_resource_usage_blocks_json(namespace, workload_name, usage_data)
         
         # Send the response message
         client.chat_postMessage(
@@ -138,7 +144,7 @@ def handle_suggest_workloads(ack, command, client, logger):
         candidates = suggest_optimization_candidates()
         
         # Build the workload suggestion message blocks
-        blocks = build_workload_suggestion_blocks(candidates)
+        blocks = build_workload_suggestion_blocks_json(candidates)
         
         # Send the response message
         client.chat_postMessage(
@@ -5,20 +5,43 @@ This module contains handlers for the interactive components like buttons,
 modals, and select menus in the Slack interface.
 """
 
+import time
 import logging
-import json
 from slack_bolt import App
 from services.k8s import modify_workload_resources, get_workload_details
 from services.ai import generate_change_justification
-from services.jira import create_jira_ticket
-from services.slack_notifier import notify_resource_change
+from services import jira_queue, ratelimit, view_state
 from views.slack_blocks import (
     build_confirmation_modal_blocks,
     build_resource_modification_modal_blocks
 )
 
+try:
+    import orjson
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+
+    _loads = orjson.loads
+except ImportError:
+    import json
+
+    _dumps = json.dumps
+    _loads = json.loads
+
 logger = logging.getLogger(__name__)
 
+# Minimum interval between modal updates while a justification is streaming
+JUSTIFICATION_UPDATE_INTERVAL = 0.3
+
+def _load_view_state(view) -> dict:
+    """Return the server-side state for a submitted modal."""
+    state_id = _loads(view["private_metadata"])["id"]
+    state = view_state.pop(state_id)
+    if state is None:
+        raise ValueError("This request has expired, please start again")
+    return state
+
 def register_slack_interactions(app: App) -> None:
     """Register all Slack interaction handlers"""
     # Button click handlers
@@ -45,7 +68,7 @@ def handle_optimize_workload_button(ack, body, client, logger):
         
         # Extract workload information from the button action
         action = body["actions"][0]
-        value = json.loads(action["value"])
+        value = _loads(action["value"])
         namespace = value.get("namespace")
         workload_name = value.get("workload")
         
@@ -63,9 +86,11 @@ def handle_optimize_workload_button(ack, body, client, logger):
                 "title": {"type": "plain_text", "text": "Optimize Resources"},
                 "submit": {"type": "plain_text", "text": "Preview Changes"},
                 "close": {"type": "plain_text", "text": "Cancel"},
-                "private_metadata": json.dumps({
-                    "namespace": namespace,
-                    "workload": workload_name
+                "private_metadata": _dumps({
+                    "id": view_state.put({
+                        "namespace": namespace,
+                        "workload": workload_name
+                    })
                 }),
                 "blocks": build_resource_modification_modal_blocks(namespace, workload_name, workload_details)
             }
@@ -94,15 +119,23 @@ def handle_workload_selection(ack, body, client, logger):
 
 def handle_resource_modification_submission(ack, body, client, view, logger):
     """Handle the submission of the resource modification form"""
+    user_id = body["user"]["id"]
+    
+    # Reject bursts before doing any expensive work, keeping the form open
+    if not ratelimit.allow(user_id):
+        ack(
+            response_action="errors",
+            errors={"cpu_request_block": "You're sending requests too quickly. Please wait a moment and try again."}
+        )
+        return
+    
     # Acknowledge the submission immediately
     ack()
     
     try:
-        user_id = body["user"]["id"]
-        
         # Extract values from the form
         values = view["state"]["values"]
-        metadata = json.loads(view["private_metadata"])
+        metadata = _load_view_state(view)
         namespace = metadata["namespace"]
         workload_name = metadata["workload"]
         
@@ -114,51 +147,68 @@ def handle_resource_modification_submission(ack, body, client, view, logger):
         
         # Get current workload details for comparison
         current_resources = get_workload_details(namespace, workload_name)
+        new_resources = {
+            "cpu_request": cpu_request,
+            "cpu_limit": cpu_limit,
+            "memory_request": memory_request,
+            "memory_limit": memory_limit
+        }
+        
+        # Show the confirmation modal right away and fill in the justification
+        # as it streams in
+        response = client.views_open(
+            trigger_id=body["trigger_id"],
+            view=_build_confirmation_view(
+                namespace,
+                workload_name,
+                current_resources,
+                new_resources,
+                "_Generating justification…_"
+            )
+        )
+        view_id = response["view"]["id"]
+        last_update = time.monotonic()
+        
+        def update_justification(partial: str) -> None:
+            nonlocal last_update
+            now = time.monotonic()
+            if now - last_update < JUSTIFICATION_UPDATE_INTERVAL:
+                return
+            last_update = now
+            try:
+                client.views_update(
+                    view_id=view_id,
+                    view=_build_confirmation_view(
+                        namespace, workload_name, current_resources, new_resources, partial
+                    )
+                )
+            except Exception as e:
+                logger.warning(f"Error updating streamed justification: {e}")
         
         # Generate justification for the change
         justification = generate_change_justification(
             namespace, 
             workload_name, 
             current_resources, 
-            {
-                "cpu_request": cpu_request,
-                "cpu_limit": cpu_limit,
-                "memory_request": memory_request,
-                "memory_limit": memory_limit
-            }
+            new_resources,
+            on_chunk=update_justification
         )
         
-        # Show confirmation modal
-        client.views_open(
-            trigger_id=body["trigger_id"],
-            view={
-                "type": "modal",
-                "callback_id": "confirmation_modal",
-                "title": {"type": "plain_text", "text": "Confirm Resource Changes"},
-                "submit": {"type": "plain_text", "text": "Apply Changes"},
-                "close": {"type": "plain_text", "text": "Cancel"},
-                "private_metadata": json.dumps({
-                    "namespace": namespace,
-                    "workload": workload_name,
-                    "cpu_request": cpu_request,
-                    "cpu_limit": cpu_limit,
-                    "memory_request": memory_request,
-                    "memory_limit": memory_limit,
-                    "justification": justification
-                }),
-                "blocks": build_confirmation_modal_blocks(
-                    namespace, 
-                    workload_name, 
-                    current_resources,
-                    {
-                        "cpu_request": cpu_request,
-                        "cpu_limit": cpu_limit,
-                        "memory_request": memory_request,
-                        "memory_limit": memory_limit
-                    },
-                    justification
-                )
-            }
+        # Show the final justification and allow the changes to be applied
+        state_id = view_state.put({
+            "namespace": namespace,
+            "workload": workload_name,
+            "cpu_request": cpu_request,
+            "cpu_limit": cpu_limit,
+            "memory_request": memory_request,
+            "memory_limit": memory_limit,
+            "justification": justification
+        })
+        client.views_update(
+            view_id=view_id,
+            view=_build_confirmation_view(
+                namespace, workload_name, current_resources, new_resources, justification, state_id
+            )
         )
     except Exception as e:
         logger.error(f"Error handling resource modification submission: {e}")
@@ -169,6 +219,33 @@ def handle_resource_modification_submission(ack, body, client, view, logger):
             text=f"Sorry, there was an error processing your resource modification: {str(e)}"
         )
 
+def _build_confirmation_view(
+    namespace,
+    workload_name,
+    current_resources,
+    new_resources,
+    justification,
+    state_id=None
+) -> dict:
+    """Build the confirmation modal. Without a state ID it can't be submitted yet."""
+    view = {
+        "type": "modal",
+        "callback_id": "confirmation_modal",
+        "title": {"type": "plain_text", "text": "Confirm Resource Changes"},
+        "close": {"type": "plain_text", "text": "Cancel"},
+        "blocks": build_confirmation_modal_blocks(
+            namespace,
+            workload_name,
+            current_resources,
+            new_resources,
+            justification
+        )
+    }
+    if state_id:
+        view["submit"] = {"type": "plain_text", "text": "Apply Changes"}
+        view["private_metadata"] = _dumps({"id": state_id})
+    return view
+
 def handle_confirmation_submission(ack, body, client, view, logger):
     """Handle the submission of the confirmation modal"""
     # Acknowledge the submission immediately
@@ -177,8 +254,8 @@ def handle_confirmation_submission(ack, body, client, view, logger):
     try:
         user_id = body["user"]["id"]
         
-        # Extract values from the form metadata
-        metadata = json.loads(view["private_metadata"])
+        # Extract values from the stored modal state
+        metadata = _load_view_state(view)
         namespace = metadata["namespace"]
         workload_name = metadata["workload"]
         cpu_request = metadata["cpu_request"]
@@ -197,8 +274,11 @@ def handle_confirmation_submission(ack, body, client, view, logger):
             memory_limit
         )
         
-        # Create Jira ticket
-        jira_ticket = create_jira_ticket(
+        # Create the Jira ticket and notify the team in the background
+        notification_channel = body.get("user", {}).get("team_id")  # Default to the team
+        jira_queue.enqueue(
+            client,
+            notification_channel,
             namespace,
             workload_name,
             {
@@ -210,25 +290,6 @@ def handle_confirmation_submission(ack, body, client, view, logger):
             justification,
             user_id
         )
-        
-        # Notify the channel
-        notification_channel = body.get("user", {}).get("team_id")  # Default to the team
-        notify_resource_change(
-            client,
-            notification_channel,
-            namespace,
-            workload_name,
-            justification,
-            jira_ticket
-        )
-        
-        # Send confirmation to the user
-        client.chat_postMessage(
-            channel=user_id,
-            text=f"✅ Successfully updated resources for {namespace}/{workload_name}.\n"
-                 f"Jira ticket created: {jira_ticket.key}\n"
-                 f"Notification sent to the team channel."
-        )
     except Exception as e:
         logger.error(f"Error handling confirmation submission: {e}")
         # Send an ephemeral message to the user
@@ -24,6 +24,4 @@ echo "Installing dependencies..."
 pip install -r requirements.txt
 
 echo "Starting GKE Resource Optimizer Slack Agent..."
-export FLASK_APP=app.py
-export FLASK_ENV=development
-flask run --host=0.0.0.0 --port=3000 
\ No newline at end of file
+gunicorn --bind 0.0.0.0:3000 --workers 1 --worker-class gevent --worker-connections 100 --reload app:flask_app 
\ No newline at end of file
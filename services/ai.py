@@ -8,28 +8,53 @@ This module contains functions for:
 """
 
 import os
+import string
 import logging
-from typing import Dict, Any, List, Tuple
-import google.generativeai as genai
-from langchain.llms import GoogleGenerativeAI
-from langchain.prompts import PromptTemplate
+import pathlib
+import functools
+import threading
+from typing import Dict, Any, List, Tuple, Callable, Optional
+from services import ai_cache
+from services.quantity import extract_numeric_value
 
 logger = logging.getLogger(__name__)
 
-# Initialize Google Gemini API
+# Relative change below which a resource change gets a canned justification
+TRIVIAL_CHANGE_THRESHOLD = 0.02
+
+TEMPLATES_DIR = pathlib.Path(__file__).with_name("templates")
+
+# Google Gemini API configuration
 API_KEY = os.environ.get("GOOGLE_GEMINI_API_KEY")
-if API_KEY:
-    genai.configure(api_key=API_KEY)
+
+# Shared LLM client, created on first use so importing this module doesn't pay
+# for loading LangChain and the Gemini SDK
+_LLM = None
+_llm_lock = threading.Lock()
 
 def get_llm():
-    """Get LLM client for generation tasks"""
-    return GoogleGenerativeAI(model="gemini-pro", google_api_key=API_KEY)
+    """Get the shared LLM client for generation tasks"""
+    global _LLM
+    if _LLM is None:
+        with _llm_lock:
+            if _LLM is None:
+                if not API_KEY:
+                    raise ValueError("Missing GOOGLE_GEMINI_API_KEY environment variable")
+                from langchain.llms import GoogleGenerativeAI
+                _LLM = GoogleGenerativeAI(model="gemini-pro", google_api_key=API_KEY)
+    return _LLM
+
+# Prompt template for the justification, loaded once at import
+_JUSTIFICATION_TEMPLATE = string.Template(
+    (TEMPLATES_DIR / "justification.tmpl").read_text()
+)
 
 def generate_change_justification(
     namespace: str,
     workload_name: str,
     current_resources: Dict[str, Any],
-    new_resources: Dict[str, Any]
+    new_resources: Dict[str, Any],
+    on_chunk: Optional[Callable[[str], None]] = None
 ) -> str:
     """
     Generate a justification for resource changes based on historical data.
@@ -39,41 +64,18 @@ def generate_change_justification(
         workload_name: The name of the workload
         current_resources: Dictionary with current resource requests and limits
         new_resources: Dictionary with new resource requests and limits
+        on_chunk: Optional callback receiving the partial justification as it is
+            streamed from the LLM. Not called for cached or canned justifications.
         
     Returns:
         A natural language justification for the changes
     """
-    llm = get_llm()
-    
-    # Create a prompt template for the justification
-    template = """
-    You are an AI assistant that helps DevOps engineers optimize Kubernetes resources.
-    You need to generate a professional and detailed justification for changes to resource requests and limits.
-    
-    Workload: {workload_name} in namespace {namespace}
-    
-    Current Resources:
-    - CPU Request: {current_cpu_request}
-    - CPU Limit: {current_cpu_limit}
-    - Memory Request: {current_memory_request}
-    - Memory Limit: {current_memory_limit}
-    
-    New Resources:
-    - CPU Request: {new_cpu_request}
-    - CPU Limit: {new_cpu_limit}
-    - Memory Request: {new_memory_request}
-    - Memory Limit: {new_memory_limit}
-    
-    Changes:
-    - CPU Request: {cpu_request_change}
-    - CPU Limit: {cpu_limit_change}
-    - Memory Request: {memory_request_change}
-    - Memory Limit: {memory_limit_change}
-    
-    Based on this information, generate a clear, concise, and professional justification for these changes.
-    Include specific technical details and benefits. Mention potential cost impacts and performance implications.
-    The justification should be suitable for a Jira ticket or team communication.
-    """
+    # Minor or no-op adjustments don't need an LLM-written justification
+    if _all_changes_trivial(current_resources, new_resources):
+        return (
+            f"Minor adjustment to {namespace}/{workload_name} resources "
+            f"within {TRIVIAL_CHANGE_THRESHOLD * 100:.0f}% tolerance."
+        )
     
     # Calculate the changes
     cpu_request_change = calculate_change(
@@ -93,47 +95,89 @@ def generate_change_justification(
         new_resources["memory_limit"]
     )
     
-    # Create the prompt
-    prompt = PromptTemplate(
-        input_variables=[
-            "namespace", "workload_name", 
-            "current_cpu_request", "current_cpu_limit", 
-            "current_memory_request", "current_memory_limit",
-            "new_cpu_request", "new_cpu_limit", 
-            "new_memory_request", "new_memory_limit",
-            "cpu_request_change", "cpu_limit_change", 
-            "memory_request_change", "memory_limit_change"
-        ],
-        template=template
-    )
-    
     # Fill the prompt template
-    formatted_prompt = prompt.format(
-        namespace=namespace,
-        workload_name=workload_name,
-        current_cpu_request=current_resources["requests"]["cpu"],
-        current_cpu_limit=current_resources["limits"]["cpu"],
-        current_memory_request=current_resources["requests"]["memory"],
-        current_memory_limit=current_resources["limits"]["memory"],
-        new_cpu_request=new_resources["cpu_request"],
-        new_cpu_limit=new_resources["cpu_limit"],
-        new_memory_request=new_resources["memory_request"],
-        new_memory_limit=new_resources["memory_limit"],
-        cpu_request_change=cpu_request_change,
-        cpu_limit_change=cpu_limit_change,
-        memory_request_change=memory_request_change,
-        memory_limit_change=memory_limit_change
-    )
+    formatted_prompt = _JUSTIFICATION_TEMPLATE.substitute({
+        "namespace": namespace,
+        "workload_name": workload_name,
+        "current_cpu_request": current_resources["requests"]["cpu"],
+        "current_cpu_limit": current_resources["limits"]["cpu"],
+        "current_memory_request": current_resources["requests"]["memory"],
+        "current_memory_limit": current_resources["limits"]["memory"],
+        "new_cpu_request": new_resources["cpu_request"],
+        "new_cpu_limit": new_resources["cpu_limit"],
+        "new_memory_request": new_resources["memory_request"],
+        "new_memory_limit": new_resources["memory_limit"],
+        "cpu_request_change": cpu_request_change,
+        "cpu_limit_change": cpu_limit_change,
+        "memory_request_change": memory_request_change,
+        "memory_limit_change": memory_limit_change
+    })
+    
+    cache_key = ai_cache.make_key(namespace, workload_name, current_resources, new_resources)
+    
+    def _generate() -> str:
+        llm = get_llm()
+        if on_chunk is None:
+            return llm.invoke(formatted_prompt).strip()
+        
+        # Stream tokens so the caller can show progress before completion
+        text = ""
+        for chunk in llm.stream(formatted_prompt):
+            text += chunk
+            on_chunk(text)
+        return text.strip()
     
     try:
-        # Generate the justification
-        justification = llm.invoke(formatted_prompt).strip()
+        # Generate the justification, reusing a cached one for identical requests
+        justification = ai_cache.get_or_create(cache_key, _generate)
         logger.info(f"Generated justification for {namespace}/{workload_name} resource changes")
         return justification
     except Exception as e:
         logger.error(f"Error generating justification: {e}")
         return f"Resource changes for {namespace}/{workload_name} to optimize cluster performance and cost efficiency."
 
+def _all_changes_trivial(
+    current_resources: Dict[str, Any],
+    new_resources: Dict[str, Any],
+    eps: float = TRIVIAL_CHANGE_THRESHOLD
+) -> bool:
+    """
+    Check whether every requested resource change is below a relative threshold.
+    
+    Args:
+        current_resources: Dictionary with current resource requests and limits
+        new_resources: Dictionary with new resource requests and limits
+        eps: The relative change below which a change is considered trivial
+        
+    Returns:
+        True if all four values are unchanged or changed by less than eps
+    """
+    pairs = [
+        (current_resources["requests"]["cpu"], new_resources["cpu_request"]),
+        (current_resources["limits"]["cpu"], new_resources["cpu_limit"]),
+        (current_resources["requests"]["memory"], new_resources["memory_request"]),
+        (current_resources["limits"]["memory"], new_resources["memory_limit"])
+    ]
+    
+    # Identical strings need no parsing
+    if all(current == new for current, new in pairs):
+        return True
+    
+    try:
+        for current, new in pairs:
+            current_numeric = extract_numeric_value(current)
+            new_numeric = extract_numeric_value(new)
+            if current_numeric == 0:
+                if new_numeric != 0:
+                    return False
+            elif abs(new_numeric - current_numeric) / current_numeric >= eps:
+                return False
+    except ValueError:
+        return False
+    
+    return True
+
+@functools.lru_cache(maxsize=4096)
 def calculate_change(current_value: str, new_value: str) -> str:
     """
     Calculate the change between two resource values.
@@ -145,15 +189,13 @@ def calculate_change(current_value: str, new_value: str) -> str:
     Returns:
         A string describing the change (e.g., "Decreased by 50%")
     """
-    # This is a simplified implementation that assumes simple numeric values
-    # In a real-world scenario, we would need to parse values like "500m" or "1Gi"
     try:
-        # Remove units for comparison
+        # Normalize units for comparison
         current_numeric = extract_numeric_value(current_value)
         new_numeric = extract_numeric_value(new_value)
         
         if current_numeric == 0:
-            return f"Increased from 0 to {new_value}"
+            return "No change" if new_numeric == 0 else f"Increased from 0 to {new_value}"
         
         percentage_change = ((new_numeric - current_numeric) / current_numeric) * 100
         
@@ -166,34 +208,3 @@ def calculate_change(current_value: str, new_value: str) -> str:
     except Exception as e:
         logger.warning(f"Error calculating change: {e}")
         return f"Changed from {current_value} to {new_value}"
-
-def extract_numeric_value(value_str: str) -> float:
-    """
-    Extract the numeric portion of a resource value string.
-    
-    Args:
-        value_str: The resource value string (e.g., "500m", "1Gi")
-        
-    Returns:
-        The numeric value
-    """
-    # This is a simplified implementation
-    # In a real-world scenario, we would need to handle various units properly
-    try:
-        # Handle millicores (e.g., "500m")
-        if value_str.endswith("m"):
-            return float(value_str[:-1]) / 1000
-        
-        # Handle memory units
-        if value_str.endswith("Mi"):
-            return float(value_str[:-2])
-        if value_str.endswith("Gi"):
-            return float(value_str[:-2]) * 1024
-        if value_str.endswith("Ki"):
-            return float(value_str[:-2]) / 1024
-        
-        # Default case: try to convert directly
-        return float(value_str)
-    except (ValueError, TypeError):
-        logger.warning(f"Could not extract numeric value from {value_str}")
-        return 0 
\ No newline at end of file
@@ -0,0 +1,126 @@
+"""
+AI response cache for GKE Resource Optimizer.
+
+This module contains an in-process TTL cache for LLM generated text so that
+identical justification requests are answered without another Gemini call.
+"""
+
+import json
+import hashlib
+import random
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional
+from cachetools import TLRUCache
+
+logger = logging.getLogger(__name__)
+
+CACHE_MAXSIZE = 1024
+CACHE_TTL = 3600
+CACHE_TTL_JITTER = 60
+INFLIGHT_WAIT_TIMEOUT = 10
+
+def _ttu(_key: str, _value: str, now: float) -> float:
+    """Expiry time for a new entry, jittered so entries don't expire in lockstep"""
+    return now + CACHE_TTL + random.uniform(0, CACHE_TTL_JITTER)
+
+_cache = TLRUCache(maxsize=CACHE_MAXSIZE, ttu=_ttu)
+_cache_lock = threading.RLock()
+_inflight: Dict[str, threading.Event] = {}
+
+def make_key(
+    namespace: str,
+    workload_name: str,
+    current_resources: Dict[str, Any],
+    new_resources: Dict[str, Any]
+) -> str:
+    """
+    Build a content-addressed cache key for a justification request.
+
+    Only the inputs of the justification prompt are hashed: the workload and
+    the CPU/memory request and limit values. Replicas, labels, annotations
+    and cache markers in `current_resources` don't change the justification,
+    so they are left out of the key.
+
+    Args:
+        namespace: The namespace of the workload
+        workload_name: The name of the workload
+        current_resources: Dictionary with current resource requests and limits
+        new_resources: Dictionary with new resource requests and limits
+
+    Returns:
+        The SHA-256 hex digest of the normalized request
+    """
+    requests = current_resources["requests"]
+    limits = current_resources["limits"]
+    payload = json.dumps(
+        [
+            namespace,
+            workload_name,
+            [str(value).strip() for value in (
+                requests["cpu"],
+                limits["cpu"],
+                requests["memory"],
+                limits["memory"],
+                new_resources["cpu_request"],
+                new_resources["cpu_limit"],
+                new_resources["memory_request"],
+                new_resources["memory_limit"]
+            )]
+        ]
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+def get(key: str) -> Optional[str]:
+    """Return the cached value for a key, or None on a miss."""
+    with _cache_lock:
+        return _cache.get(key)
+
+def _store(key: str, value: str) -> str:
+    """Store a value and return it."""
+    with _cache_lock:
+        _cache[key] = value
+    return value
+
+def get_or_create(key: str, create: Callable[[], str]) -> str:
+    """
+    Return the cached value for a key, computing and storing it on a miss.
+
+    Concurrent misses for the same key are coalesced (single-flight): the
+    first caller runs `create` while the others wait up to
+    INFLIGHT_WAIT_TIMEOUT seconds for its result. A waiter whose leader fails
+    or is too slow computes the value itself. Exceptions raised by `create`
+    are propagated and nothing is cached.
+
+    Args:
+        key: The cache key (see `make_key`)
+        create: Callable producing the value on a miss
+
+    Returns:
+        The cached or newly created value
+    """
+    with _cache_lock:
+        value = _cache.get(key)
+        if value is not None:
+            logger.info(f"AI cache hit for {key[:12]}")
+            return value
+
+        event = _inflight.get(key)
+        is_leader = event is None
+        if is_leader:
+            event = _inflight[key] = threading.Event()
+
+    if not is_leader:
+        if event.wait(timeout=INFLIGHT_WAIT_TIMEOUT):
+            value = get(key)
+            if value is not None:
+                return value
+        logger.info(f"AI cache in-flight request for {key[:12]} unavailable, generating directly")
+        return _store(key, create())
+
+    try:
+        return _store(key, create())
+    finally:
+        with _cache_lock:
+            _inflight.pop(key, None)
+        event.set()
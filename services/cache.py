@@ -0,0 +1,179 @@
+"""
+Caching helpers for GKE Resource Optimizer.
+
+This module contains a small time-based memoization decorator used to keep
+short-lived copies of Kubernetes API responses.
+"""
+
+import time
+import inspect
+import logging
+import functools
+import threading
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+def time_cache(
+    ttl: float,
+    maxsize: int = 256,
+    stale_ttl: float = 0,
+    stale_if: Optional[Callable[[Exception], bool]] = None,
+    annotate_stale: bool = False,
+    refresh_ahead: Optional[float] = None,
+    executor: Optional[Executor] = None,
+    error_backoff: Optional[float] = None
+) -> Callable:
+    """
+    Cache a function's results per argument tuple for `ttl` seconds.
+
+    Entries are kept for a further `stale_ttl` seconds after they expire. If
+    refreshing an expired entry raises an error accepted by `stale_if`, the
+    last known value is returned instead of the error (stale-if-error), so an
+    entry is usable for at most `ttl + stale_ttl` seconds. After such an error
+    the stale value is served without calling the function again for
+    `error_backoff` seconds, so a struggling backend isn't sent a request on
+    every call.
+
+    With `refresh_ahead`, a hit on an entry older than that fraction of `ttl`
+    returns the cached value immediately and refreshes it in the background
+    (stale-while-revalidate), so steady traffic never waits on a refresh.
+
+    A result is only stored if its entry wasn't invalidated while it was being
+    computed, so a refresh that read the old data before a change can't put
+    it back afterwards.
+
+    The decorated function gains:
+    - `invalidate(*args, **kwargs)` to drop the entry for one set of arguments
+    - `cache_clear()` to drop every entry
+
+    Args:
+        ttl: Seconds an entry stays fresh
+        maxsize: Maximum number of entries; the oldest is evicted when full
+        stale_ttl: Seconds an expired entry may still be served on error
+        stale_if: Predicate selecting the errors that fall back to a stale entry
+        annotate_stale: Add "_stale" and "_generated_at" keys to stale dict values
+        refresh_ahead: Fraction of `ttl` after which hits trigger a background refresh
+        executor: Executor for background refreshes; a thread is started per
+            refresh if omitted
+        error_backoff: Seconds to serve a stale entry after an error before
+            retrying; defaults to `ttl`
+
+    Returns:
+        The decorator
+    """
+    backoff = ttl if error_backoff is None else error_backoff
+
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+        # key -> (monotonic time stored, value, wall clock time stored)
+        entries: Dict[Tuple, Tuple[float, Any, float]] = {}
+        refreshing: Set[Tuple] = set()
+        # key -> monotonic time until which errors are answered from the stale entry
+        failed: Dict[Tuple, float] = {}
+        # Bumped by invalidate (per key) and cache_clear (for every key)
+        versions: Dict[Tuple, int] = {}
+        generation = 0
+        lock = threading.RLock()
+
+        def make_key(*args, **kwargs) -> Tuple:
+            # Bind against the signature so f(x), f(x=x) and defaults share a key
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return tuple(bound.arguments.values())
+
+        def version(key: Tuple) -> Tuple[int, int]:
+            with lock:
+                return generation, versions.get(key, 0)
+
+        def store(key: Tuple, value: Any, seen: Tuple[int, int]) -> None:
+            with lock:
+                if version(key) != seen:
+                    # Invalidated while the value was being computed
+                    return
+                if key not in entries and len(entries) >= maxsize:
+                    # Dicts keep insertion order, so the first key is the oldest
+                    oldest = next(iter(entries))
+                    del entries[oldest]
+                    failed.pop(oldest, None)
+                entries[key] = (time.monotonic(), value, time.time())
+                failed.pop(key, None)
+
+        def serve_stale(entry: Tuple[float, Any, float]) -> Any:
+            if annotate_stale and isinstance(entry[1], dict):
+                return {**entry[1], "_stale": True, "_generated_at": entry[2]}
+            return entry[1]
+
+        def refresh(key: Tuple, seen: Tuple[int, int], args: Tuple, kwargs: Dict[str, Any]) -> None:
+            try:
+                store(key, func(*args, **kwargs), seen)
+            except Exception as e:
+                logger.warning(f"Background refresh of {func.__name__} failed: {e}")
+            finally:
+                with lock:
+                    refreshing.discard(key)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = make_key(*args, **kwargs)
+
+            with lock:
+                seen = version(key)
+                entry = entries.get(key)
+                if entry is not None:
+                    age = time.monotonic() - entry[0]
+                    if age < ttl:
+                        if refresh_ahead is None or age < ttl * refresh_ahead or key in refreshing:
+                            return entry[1]
+                        refreshing.add(key)
+                    elif age >= ttl + stale_ttl:
+                        del entries[key]
+                        failed.pop(key, None)
+                        entry = None
+                    elif time.monotonic() < failed.get(key, 0):
+                        # Still backing off after an error
+                        return serve_stale(entry)
+
+            if entry is not None and age < ttl:
+                # Fresh but due for a refresh; serve it and refresh in the background
+                if executor is not None:
+                    executor.submit(refresh, key, seen, args, kwargs)
+                else:
+                    threading.Thread(target=refresh, args=(key, seen, args, kwargs), daemon=True).start()
+                return entry[1]
+
+            try:
+                value = func(*args, **kwargs)
+            except Exception as e:
+                if entry is None or stale_if is None or not stale_if(e):
+                    raise
+                logger.warning(f"Serving stale {func.__name__} result after error: {e}")
+                with lock:
+                    if version(key) == seen and key in entries:
+                        failed[key] = time.monotonic() + backoff
+                return serve_stale(entry)
+
+            store(key, value, seen)
+            return value
+
+        def invalidate(*args, **kwargs) -> None:
+            key = make_key(*args, **kwargs)
+            with lock:
+                entries.pop(key, None)
+                failed.pop(key, None)
+                versions[key] = versions.get(key, 0) + 1
+
+        def cache_clear() -> None:
+            nonlocal generation
+            with lock:
+                entries.clear()
+                failed.clear()
+                versions.clear()
+                generation += 1
+
+        wrapper.invalidate = invalidate
+        wrapper.cache_clear = cache_clear
+        return wrapper
+
+    return decorator
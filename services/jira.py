@@ -5,14 +5,38 @@ This module contains functions for creating Jira tickets to document resource ch
 """
 
 import os
+import zlib
+import string
 import logging
-from typing import Dict, Any
-from jira import JIRA
+import pathlib
+import functools
+from typing import Dict, Any, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from jira import JIRA
 
 logger = logging.getLogger(__name__)
 
-def get_jira_client() -> JIRA:
-    """Initialize and return a Jira client."""
+# Ticket description template, loaded once at import
+_DESCRIPTION_TEMPLATE = string.Template(
+    (pathlib.Path(__file__).with_name("templates") / "jira_description.tmpl").read_text()
+)
+
+JIRA_PROJECT_KEY = os.environ.get("JIRA_PROJECT")
+if not JIRA_PROJECT_KEY:
+    logger.warning("Missing JIRA_PROJECT environment variable, Jira tickets will not be created")
+
+@functools.lru_cache(maxsize=1)
+def get_jira_client() -> "JIRA":
+    """
+    Initialize and return a Jira client.
+    
+    The client is created once and reused, so ticket creation shares one
+    authenticated HTTP session instead of reconnecting every time. The Jira
+    SDK is imported here so it is only loaded once a ticket is created.
+    """
+    from jira import JIRA
+    
     jira_url = os.environ.get("JIRA_URL")
     jira_username = os.environ.get("JIRA_USERNAME")
     jira_api_token = os.environ.get("JIRA_API_TOKEN")
@@ -47,37 +71,29 @@ def create_jira_ticket(
         The created Jira issue
     """
     try:
-        jira = get_jira_client()
-        project_key = os.environ.get("JIRA_PROJECT")
-        
-        if not project_key:
-            logger.error("Missing JIRA_PROJECT environment variable")
+        if not JIRA_PROJECT_KEY:
             raise ValueError("Missing JIRA_PROJECT environment variable")
         
+        jira = get_jira_client()
+        
         # Create the ticket summary
         summary = f"GKE Resource Optimization: {namespace}/{workload_name}"
         
         # Create the ticket description
-        description = f"""
-        *GKE Resource Optimization*
-        
-        *Workload*: {namespace}/{workload_name}
-        
-        *New Resources*:
-        - CPU Request: {new_resources['cpu_request']}
-        - CPU Limit: {new_resources['cpu_limit']}
-        - Memory Request: {new_resources['memory_request']}
-        - Memory Limit: {new_resources['memory_limit']}
-        
-        *Justification*:
-        {justification}
-        
-        *Initiated by*: {slack_user_id}
-        """
+        description = _DESCRIPTION_TEMPLATE.substitute(
+            namespace=namespace,
+            workload_name=workload_name,
+            cpu_request=new_resources['cpu_request'],
+            cpu_limit=new_resources['cpu_limit'],
+            memory_request=new_resources['memory_request'],
+            memory_limit=new_resources['memory_limit'],
+            justification=justification,
+            slack_user_id=slack_user_id
+        )
         
         # Create the issue
         issue_dict = {
-            'project': {'key': project_key},
+            'project': {'key': JIRA_PROJECT_KEY},
             'summary': summary,
             'description': description,
             'issuetype': {'name': 'Task'},
@@ -96,4 +112,6 @@ def create_jira_ticket(
             def __init__(self, key):
                 self.key = key
         
-        return MockIssue(f"MOCK-{hash(namespace + workload_name) % 1000}") 
\ No newline at end of file
+        # CRC32 rather than hash() so the key is stable across restarts
+        workload_key = f"{namespace}/{workload_name}".encode()
+        return MockIssue(f"MOCK-{zlib.crc32(workload_key) % 10000:04d}") 
\ No newline at end of file
@@ -0,0 +1,151 @@
+"""
+Jira ticket queue for GKE Resource Optimizer.
+
+This module contains a bounded in-process queue and a small worker pool that
+create Jira tickets and send the follow-up Slack messages for applied resource
+changes, so Slack interaction handlers don't block on the Jira API.
+"""
+
+import os
+import time
+import atexit
+import queue
+import logging
+import threading
+from typing import Dict, Any
+from services.jira import create_jira_ticket
+from services.slack_notifier import notify_resource_change, post_message
+
+logger = logging.getLogger(__name__)
+
+QUEUE_MAXSIZE = 512
+WORKER_COUNT = int(os.environ.get("JIRA_QUEUE_WORKERS", "4"))
+DRAIN_TIMEOUT = 20
+
+_queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=QUEUE_MAXSIZE)
+
+def enqueue(
+    slack_client,
+    notification_channel: str,
+    namespace: str,
+    workload_name: str,
+    new_resources: Dict[str, Any],
+    justification: str,
+    slack_user_id: str
+) -> None:
+    """
+    Queue Jira ticket creation and notifications for an applied resource change.
+
+    If the queue is full the job is processed inline, so a backlog slows the
+    caller down instead of dropping the ticket.
+
+    Args:
+        slack_client: The Slack client
+        notification_channel: The channel to send the team notification to
+        namespace: The namespace of the workload
+        workload_name: The name of the workload
+        new_resources: Dictionary with new resource requests and limits
+        justification: The justification for the changes
+        slack_user_id: The Slack user ID who initiated the change
+    """
+    job = {
+        "slack_client": slack_client,
+        "notification_channel": notification_channel,
+        "namespace": namespace,
+        "workload_name": workload_name,
+        "new_resources": new_resources,
+        "justification": justification,
+        "slack_user_id": slack_user_id
+    }
+
+    try:
+        _queue.put_nowait(job)
+    except queue.Full:
+        logger.warning(f"Jira queue full, processing {namespace}/{workload_name} inline")
+        _process(job)
+
+def depth() -> int:
+    """Return the number of jobs waiting in the queue."""
+    return _queue.qsize()
+
+def drain(timeout: float = DRAIN_TIMEOUT) -> bool:
+    """
+    Wait for queued jobs to be processed.
+
+    The resource change is already applied when a job is queued, so on
+    shutdown (e.g. a SIGTERM during a rollout) the ticket and notifications
+    are still sent. Registered with atexit after the Slack notifier's drain,
+    so it runs first and the Slack messages it queues are drained too.
+
+    Args:
+        timeout: Maximum number of seconds to wait
+
+    Returns:
+        True if the queue was emptied before the timeout
+    """
+    deadline = time.monotonic() + timeout
+    with _queue.all_tasks_done:
+        while _queue.unfinished_tasks:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.warning(f"Shutting down with {_queue.unfinished_tasks} Jira jobs unprocessed")
+                return False
+            _queue.all_tasks_done.wait(remaining)
+    return True
+
+def _process(job: Dict[str, Any]) -> None:
+    """Create the Jira ticket for a job and send the Slack messages."""
+    slack_client = job["slack_client"]
+    namespace = job["namespace"]
+    workload_name = job["workload_name"]
+    user_id = job["slack_user_id"]
+
+    try:
+        jira_ticket = create_jira_ticket(
+            namespace,
+            workload_name,
+            job["new_resources"],
+            job["justification"],
+            user_id
+        )
+
+        # Notify the channel
+        notify_resource_change(
+            slack_client,
+            job["notification_channel"],
+            namespace,
+            workload_name,
+            job["justification"],
+            jira_ticket
+        )
+
+        # Send confirmation to the user
+        post_message(
+            slack_client,
+            channel=user_id,
+            text=f"✅ Successfully updated resources for {namespace}/{workload_name}.\n"
+                 f"Jira ticket created: {jira_ticket.key}\n"
+                 f"Notification sent to the team channel."
+        )
+    except Exception as e:
+        logger.error(f"Error processing Jira job for {namespace}/{workload_name}: {e}")
+        post_message(
+            slack_client,
+            channel=user_id,
+            text=f"⚠️ Resources for {namespace}/{workload_name} were updated, but there was an error "
+                 f"creating the Jira ticket or notifying the team: {str(e)}"
+        )
+
+def _worker() -> None:
+    """Process queued jobs until the process exits."""
+    while True:
+        job = _queue.get()
+        try:
+            _process(job)
+        finally:
+            _queue.task_done()
+
+for _i in range(WORKER_COUNT):
+    threading.Thread(target=_worker, name=f"jira-worker-{_i}", daemon=True).start()
+
+atexit.register(drain)
@@ -9,34 +9,133 @@ This module contains functions for interacting with Kubernetes clusters to:
 
 import os
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List, Optional, Tuple
 from kubernetes import client, config
 from google.cloud import container_v1
+from services import k8s_informer
+from services.cache import time_cache
+from services.quantity import extract_numeric_value
 
 logger = logging.getLogger(__name__)
 
+# Short-lived caches so the API server is hit once per user flow rather than
+# once per modal step
+WORKLOAD_CACHE_TTL = 30
+
+# Shared API client, sized for the number of concurrent requests we serve
+K8S_CONNECTION_POOL_SIZE = int(os.environ.get("K8S_CONNECTION_POOL_SIZE", "16"))
+_CLIENT: Optional[client.AppsV1Api] = None
+_client_lock = threading.Lock()
+
+# Bounded pool for concurrent API calls, so fan-out never exceeds what the
+# connection pool and API server rate limits can absorb
+K8S_MAX_WORKERS = int(os.environ.get("K8S_MAX_WORKERS", "8"))
+_K8S_POOL = ThreadPoolExecutor(max_workers=K8S_MAX_WORKERS, thread_name_prefix="k8s")
+
+# Maximum time a modification waits for the informer to observe its own patch
+INFORMER_SYNC_TIMEOUT = 5
+
+# While the API server is throttling or failing, keep serving the last known
+# workloads for this long past their TTL, and refresh entries in the
+# background once they are 80% through their TTL
+WORKLOAD_STALE_TTL = 300
+WORKLOAD_REFRESH_AHEAD = 0.8
+_STALE_IF_STATUSES = {429, 500, 503}
+
+def _is_transient(e: Exception) -> bool:
+    """Return True for API errors that should fall back to cached data"""
+    return isinstance(e, client.exceptions.ApiException) and e.status in _STALE_IF_STATUSES
+
 def get_k8s_client() -> client.AppsV1Api:
     """
-    Initialize and return a Kubernetes client.
+    Return the shared Kubernetes client, initializing it on first use.
     
     If running inside a cluster, uses in-cluster config.
     Otherwise, uses kubeconfig file or specified context.
+    
+    The client is created once so every call shares one configuration and
+    one urllib3 connection pool.
+    """
+    global _CLIENT
+    if _CLIENT is not None:
+        return _CLIENT
+    
+    with _client_lock:
+        if _CLIENT is None:
+            configuration = client.Configuration()
+            try:
+                # Try to load in-cluster config first
+                config.load_incluster_config(client_configuration=configuration)
+                logger.info("Using in-cluster Kubernetes configuration")
+            except config.ConfigException:
+                # Fall back to kubeconfig
+                k8s_context = os.environ.get("K8S_CONTEXT")
+                if k8s_context:
+                    config.load_kube_config(context=k8s_context, client_configuration=configuration)
+                    logger.info(f"Using Kubernetes configuration with context: {k8s_context}")
+                else:
+                    config.load_kube_config(client_configuration=configuration)
+                    logger.info("Using default Kubernetes configuration from kubeconfig")
+            
+            configuration.connection_pool_maxsize = K8S_CONNECTION_POOL_SIZE
+            api_client = client.ApiClient(configuration=configuration)
+            
+            # Deployment lists compress well; urllib3 decompresses transparently.
+            # The API server never compresses watch streams, so the informer is
+            # unaffected.
+            api_client.set_default_header("Accept-Encoding", "gzip")
+            _CLIENT = client.AppsV1Api(api_client=api_client)
+    
+    return _CLIENT
+
+def start_informer() -> None:
+    """
+    Start watching deployments in the background.
+    
+    Once the informer has synced, workload reads are answered from its
+    in-memory copy instead of the API server, for as long as it has been
+    confirmed current within WORKLOAD_STALE_TTL.
     """
+    k8s_informer.start(get_k8s_client)
+
+@time_cache(
+    ttl=WORKLOAD_CACHE_TTL,
+    maxsize=1,
+    stale_ttl=WORKLOAD_STALE_TTL,
+    stale_if=_is_transient,
+    refresh_ahead=WORKLOAD_REFRESH_AHEAD,
+    executor=_K8S_POOL
+)
+def get_all_workloads_cached() -> Dict[str, Dict[str, client.V1Deployment]]:
+    """
+    List every deployment in the cluster with a single API call.
+    
+    The result is cached, so callers that need many workloads share one LIST
+    instead of issuing a GET per workload.
+    
+    Returns:
+        A dictionary mapping namespace to a dictionary of name to Deployment
+    """
+    k8s_client = get_k8s_client()
+    
     try:
-        # Try to load in-cluster config first
-        config.load_incluster_config()
-        logger.info("Using in-cluster Kubernetes configuration")
-    except config.ConfigException:
-        # Fall back to kubeconfig
-        k8s_context = os.environ.get("K8S_CONTEXT")
-        if k8s_context:
-            config.load_kube_config(context=k8s_context)
-            logger.info(f"Using Kubernetes configuration with context: {k8s_context}")
-        else:
-            config.load_kube_config()
-            logger.info("Using default Kubernetes configuration from kubeconfig")
+        # resourceVersion=0 lets the API server answer from its watch cache
+        # instead of a quorum read from etcd
+        deployments = k8s_client.list_deployment_for_all_namespaces(
+            resource_version="0",
+            resource_version_match="NotOlderThan"
+        )
+    except client.exceptions.ApiException as e:
+        logger.error(f"Error getting Kubernetes deployments: {e}")
+        raise
+    
+    index: Dict[str, Dict[str, client.V1Deployment]] = {}
+    for deployment in deployments.items:
+        index.setdefault(deployment.metadata.namespace, {})[deployment.metadata.name] = deployment
     
-    return client.AppsV1Api()
+    return index
 
 def get_workloads(namespace: Optional[str] = None) -> List[Dict[str, Any]]:
     """
@@ -48,51 +147,126 @@ def get_workloads(namespace: Optional[str] = None) -> List[Dict[str, Any]]:
     Returns:
         A list of deployment details dictionaries.
     """
-    k8s_client = get_k8s_client()
-    
-    try:
+    if k8s_informer.is_synced(WORKLOAD_STALE_TTL):
+        deployments = k8s_informer.list_deployments(namespace)
+    else:
+        index = get_all_workloads_cached()
         if namespace:
-            deployments = k8s_client.list_namespaced_deployment(namespace)
+            deployments = list(index.get(namespace, {}).values())
         else:
-            deployments = k8s_client.list_deployment_for_all_namespaces()
+            deployments = [deployment for by_name in index.values() for deployment in by_name.values()]
+    
+    workload_list = []
+    for deployment in deployments:
+        name = deployment.metadata.name
+        ns = deployment.metadata.namespace
+        containers = deployment.spec.template.spec.containers
         
-        workload_list = []
-        for deployment in deployments.items:
-            name = deployment.metadata.name
-            ns = deployment.metadata.namespace
-            containers = deployment.spec.template.spec.containers
-            
-            # Extract resource requests and limits for the first container
-            resources = containers[0].resources if containers else None
-            
-            # Format the resources
-            formatted_resources = {
-                "requests": {},
-                "limits": {}
-            }
-            
-            if resources:
-                if resources.requests:
-                    formatted_resources["requests"] = resources.requests
-                if resources.limits:
-                    formatted_resources["limits"] = resources.limits
-            
-            workload_list.append({
-                "name": name,
-                "namespace": ns,
-                "replicas": deployment.spec.replicas,
-                "resources": formatted_resources
-            })
+        # Extract resource requests and limits for the first container
+        resources = containers[0].resources if containers else None
         
-        return workload_list
-    except client.exceptions.ApiException as e:
-        logger.error(f"Error getting Kubernetes deployments: {e}")
-        raise
+        # Format the resources
+        formatted_resources = {
+            "requests": {},
+            "limits": {}
+        }
+        
+        if resources:
+            if resources.requests:
+                formatted_resources["requests"] = resources.requests
+            if resources.limits:
+                formatted_resources["limits"] = resources.limits
+        
+        workload_list.append({
+            "name": name,
+            "namespace": ns,
+            "replicas": deployment.spec.replicas,
+            "resources": formatted_resources
+        })
+    
+    return workload_list
+
+def _parse_quantity(quantity: str, scale: float) -> Optional[int]:
+    """
+    Convert a resource quantity to an integer number of scaled base units.
+    
+    Returns None for quantities that can't be parsed, so one odd value doesn't
+    break every read of the workload.
+    """
+    try:
+        return round(extract_numeric_value(quantity) * scale)
+    except ValueError as e:
+        logger.warning(f"Could not parse resource quantity: {e}")
+        return None
+
+def _to_workload_details(deployment: client.V1Deployment) -> Dict[str, Any]:
+    """
+    Convert a Deployment into the workload details dictionary.
+    
+    Args:
+        deployment: The Deployment object from the Kubernetes API
+        
+    Returns:
+        A dictionary with workload details
+    """
+    containers = deployment.spec.template.spec.containers
+    container = containers[0] if containers else None
+    
+    resources = {
+        "requests": {
+            "cpu": "0",
+            "memory": "0"
+        },
+        "limits": {
+            "cpu": "0",
+            "memory": "0"
+        }
+    }
+    
+    if container and container.resources:
+        if container.resources.requests:
+            cpu_request = container.resources.requests.get("cpu", "0")
+            memory_request = container.resources.requests.get("memory", "0")
+            resources["requests"]["cpu"] = str(cpu_request)
+            resources["requests"]["memory"] = str(memory_request)
+    
+        if container.resources.limits:
+            cpu_limit = container.resources.limits.get("cpu", "0")
+            memory_limit = container.resources.limits.get("memory", "0")
+            resources["limits"]["cpu"] = str(cpu_limit)
+            resources["limits"]["memory"] = str(memory_limit)
+    
+    # Parse once here so consumers can compare numbers instead of re-parsing
+    # the display strings
+    for values in resources.values():
+        values["cpu_m"] = _parse_quantity(values["cpu"], 1000)
+        values["memory_bytes"] = _parse_quantity(values["memory"], 1)
+    
+    return {
+        "name": deployment.metadata.name,
+        "namespace": deployment.metadata.namespace,
+        "replicas": deployment.spec.replicas,
+        "resources": resources,
+        "labels": deployment.metadata.labels or {},
+        "annotations": deployment.metadata.annotations or {},
+        "container_name": container.name if container else ""
+    }
 
+@time_cache(
+    ttl=WORKLOAD_CACHE_TTL,
+    stale_ttl=WORKLOAD_STALE_TTL,
+    stale_if=_is_transient,
+    annotate_stale=True,
+    refresh_ahead=WORKLOAD_REFRESH_AHEAD,
+    executor=_K8S_POOL
+)
 def get_workload_details(namespace: str, workload_name: str) -> Dict[str, Any]:
     """
     Get detailed information about a specific workload.
     
+    If the API server is throttling or failing, the last known details are
+    returned with "_stale" and "_generated_at" (Unix time) keys added.
+    
     Args:
         namespace: The namespace of the workload
         workload_name: The name of the workload (deployment)
@@ -100,6 +274,15 @@ def get_workload_details(namespace: str, workload_name: str) -> Dict[str, Any]:
     Returns:
         A dictionary with workload details
     """
+    # Serve from the informer or the cached cluster-wide LIST, falling back to
+    # a direct GET for workloads neither has seen yet
+    if k8s_informer.is_synced(WORKLOAD_STALE_TTL):
+        deployment = k8s_informer.get(namespace, workload_name)
+    else:
+        deployment = get_all_workloads_cached().get(namespace, {}).get(workload_name)
+    if deployment is not None:
+        return _to_workload_details(deployment)
+    
     k8s_client = get_k8s_client()
     
     try:
@@ -108,46 +291,46 @@ def get_workload_details(namespace: str, workload_name: str) -> Dict[str, Any]:
             namespace=namespace
         )
         
-        containers = deployment.spec.template.spec.containers
-        container = containers[0] if containers else None
-        
-        resources = {
-            "requests": {
-                "cpu": "0",
-                "memory": "0"
-            },
-            "limits": {
-                "cpu": "0",
-                "memory": "0"
-            }
-        }
-        
-        if container and container.resources:
-            if container.resources.requests:
-                cpu_request = container.resources.requests.get("cpu", "0")
-                memory_request = container.resources.requests.get("memory", "0")
-                resources["requests"]["cpu"] = str(cpu_request)
-                resources["requests"]["memory"] = str(memory_request)
-            
-            if container.resources.limits:
-                cpu_limit = container.resources.limits.get("cpu", "0")
-                memory_limit = container.resources.limits.get("memory", "0")
-                resources["limits"]["cpu"] = str(cpu_limit)
-                resources["limits"]["memory"] = str(memory_limit)
-        
-        return {
-            "name": workload_name,
-            "namespace": namespace,
-            "replicas": deployment.spec.replicas,
-            "resources": resources,
-            "labels": deployment.metadata.labels or {},
-            "annotations": deployment.metadata.annotations or {},
-            "container_name": container.name if container else ""
-        }
+        return _to_workload_details(deployment)
     except client.exceptions.ApiException as e:
         logger.error(f"Error getting Kubernetes deployment {namespace}/{workload_name}: {e}")
         raise
 
+def get_workload_details_many(
+    workloads: List[Tuple[str, str]],
+    return_exceptions: bool = False
+) -> List[Any]:
+    """
+    Get details for several workloads concurrently.
+    
+    Args:
+        workloads: A list of (namespace, workload_name) pairs
+        return_exceptions: If True, a failed lookup returns its exception in
+            place of the details instead of raising
+        
+    Returns:
+        A list of workload details dictionaries, in the same order as the input
+    """
+    def lookup(workload: Tuple[str, str]) -> Any:
+        try:
+            return get_workload_details(*workload)
+        except Exception as e:
+            if not return_exceptions:
+                raise
+            return e
+
+    # Warm the cluster-wide LIST once up front; otherwise every pool thread
+    # misses the cold cache at the same time and sends its own LIST
+    if workloads and not k8s_informer.is_synced(WORKLOAD_STALE_TTL):
+        try:
+            get_all_workloads_cached()
+        except Exception as e:
+            # Each lookup reports the error itself
+            logger.warning(f"Error listing workloads before lookups: {e}")
+
+    return list(_K8S_POOL.map(lookup, workloads))
+
+@time_cache(ttl=WORKLOAD_CACHE_TTL)
 def get_resource_usage(namespace: str, workload_name: str) -> Dict[str, Any]:
     """
     Get resource usage metrics for a specific workload.
@@ -201,11 +384,15 @@ def modify_workload_resources(
     cpu_request: str,
     cpu_limit: str,
     memory_request: str,
-    memory_limit: str
+    memory_limit: str,
+    container_name: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Modify resource requests and limits for a specific workload.
     
+    Only the container's resources are sent to the API server, as a strategic
+    merge patch, instead of the whole Deployment.
+    
     Args:
         namespace: The namespace of the workload
         workload_name: The name of the workload (deployment)
@@ -213,56 +400,77 @@ def modify_workload_resources(
         cpu_limit: New CPU limit value
         memory_request: New memory request value
         memory_limit: New memory limit value
+        container_name: The container to update. Defaults to the first
+            container, looked up from the (cached) workload details.
         
     Returns:
         The updated workload details
     """
     k8s_client = get_k8s_client()
     
+    if not container_name:
+        container_name = get_workload_details(namespace, workload_name)["container_name"]
+    
+    # Ensure at least one container exists
+    if not container_name:
+        raise ValueError(f"Deployment {namespace}/{workload_name} has no containers")
+    
+    # Containers are merged by name, so only this container's resources change
+    patch = {
+        "spec": {
+            "template": {
+                "spec": {
+                    "containers": [
+                        {
+                            "name": container_name,
+                            "resources": {
+                                "requests": {
+                                    "cpu": cpu_request,
+                                    "memory": memory_request
+                                },
+                                "limits": {
+                                    "cpu": cpu_limit,
+                                    "memory": memory_limit
+                                }
+                            }
+                        }
+                    ]
+                }
+            }
+        }
+    }
+    
     try:
-        # Get the current deployment
-        deployment = k8s_client.read_namespaced_deployment(
-            name=workload_name,
-            namespace=namespace
-        )
-        
-        # Ensure at least one container exists
-        if not deployment.spec.template.spec.containers:
-            raise ValueError(f"Deployment {namespace}/{workload_name} has no containers")
-        
-        # Update the resources for the first container
-        container = deployment.spec.template.spec.containers[0]
-        
-        # Initialize the resources if they don't exist
-        if not container.resources:
-            container.resources = client.V1ResourceRequirements(
-                requests={},
-                limits={}
-            )
-        
-        # Update requests
-        if not container.resources.requests:
-            container.resources.requests = {}
-        container.resources.requests["cpu"] = cpu_request
-        container.resources.requests["memory"] = memory_request
-        
-        # Update limits
-        if not container.resources.limits:
-            container.resources.limits = {}
-        container.resources.limits["cpu"] = cpu_limit
-        container.resources.limits["memory"] = memory_limit
-        
-        # Update the deployment
-        k8s_client.patch_namespaced_deployment(
+        # A dict body is sent as application/strategic-merge-patch+json
+        deployment = k8s_client.patch_namespaced_deployment(
             name=workload_name,
             namespace=namespace,
-            body=deployment
+            body=patch
         )
         
         logger.info(f"Successfully updated resources for {namespace}/{workload_name}")
         
-        # Return the updated workload details
-        return get_workload_details(namespace, workload_name)
+        # Let the informer catch up so reads right after this one see the change
+        if k8s_informer.is_synced(WORKLOAD_STALE_TTL) and not k8s_informer.wait_for_generation(
+            namespace, workload_name, deployment.metadata.generation, timeout=INFORMER_SYNC_TIMEOUT
+        ):
+            logger.warning(f"Informer did not observe the update to {namespace}/{workload_name} in time")
+        
+        # The patch response is the updated Deployment, so no extra read is needed
+        invalidate_workload(namespace, workload_name)
+        return _to_workload_details(deployment)
     except client.exceptions.ApiException as e:
         logger.error(f"Error updating Kubernetes deployment {namespace}/{workload_name}: {e}")
-        raise 
\ No newline at end of file
+        raise
+
+def invalidate_workload(namespace: str, workload_name: str) -> None:
+    """
+    Drop cached data that includes a workload.
+    
+    Args:
+        namespace: The namespace of the workload
+        workload_name: The name of the workload (deployment)
+    """
+    get_workload_details.invalidate(namespace, workload_name)
+    get_resource_usage.invalidate(namespace, workload_name)
+    get_all_workloads_cached.cache_clear()
\ No newline at end of file
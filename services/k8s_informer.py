@@ -0,0 +1,171 @@
+"""
+Deployment informer for GKE Resource Optimizer.
+
+This module keeps an in-memory copy of every Deployment in the cluster,
+populated with one LIST and kept current by a single WATCH stream running in
+a background thread. Reads are served from memory without API calls.
+
+The cache counts as synced only while the LIST or WATCH has confirmed it
+recently, so callers can fall back to the API server when the watch is down.
+"""
+
+import time
+import logging
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+from kubernetes import client, watch
+
+logger = logging.getLogger(__name__)
+
+MAX_BACKOFF = 60
+
+# Each watch request ends after this long, which confirms the cache is still
+# current even when no deployment changed; the watch then resumes from the
+# last seen resourceVersion without a relist
+WATCH_TIMEOUT = 240
+
+# A watch that ends cleanly sooner than this (e.g. cut by a proxy) is treated
+# as a failure rather than as confirmation that the cache is current
+MIN_WATCH_DURATION = 30
+
+_deployments: Dict[Tuple[str, str], client.V1Deployment] = {}
+_changed = threading.Condition(threading.RLock())
+# Monotonic time the cache was last confirmed current, or None before the
+# first LIST
+_last_sync: Optional[float] = None
+_thread: Optional[threading.Thread] = None
+_start_lock = threading.Lock()
+
+def start(client_factory: Callable[[], client.AppsV1Api]) -> None:
+    """
+    Start the informer thread if it isn't already running.
+
+    Args:
+        client_factory: Callable returning the Kubernetes client to use
+    """
+    global _thread
+    with _start_lock:
+        if _thread is None:
+            _thread = threading.Thread(
+                target=_run,
+                args=(client_factory,),
+                name="k8s-informer",
+                daemon=True
+            )
+            _thread.start()
+
+def is_synced(max_age: Optional[float] = None) -> bool:
+    """
+    Return True once the initial LIST has been loaded.
+
+    Args:
+        max_age: If given, also require the cache to have been confirmed
+            current within this many seconds
+    """
+    last_sync = _last_sync
+    if last_sync is None:
+        return False
+    return max_age is None or time.monotonic() - last_sync < max_age
+
+def _mark_synced() -> None:
+    """Record that the cache is current as of now."""
+    global _last_sync
+    _last_sync = time.monotonic()
+
+def get(namespace: str, name: str) -> Optional[client.V1Deployment]:
+    """Return the cached Deployment, or None if it isn't known."""
+    with _changed:
+        return _deployments.get((namespace, name))
+
+def list_deployments(namespace: Optional[str] = None) -> List[client.V1Deployment]:
+    """Return the cached Deployments, optionally filtered by namespace."""
+    with _changed:
+        if namespace:
+            return [d for (ns, _), d in _deployments.items() if ns == namespace]
+        return list(_deployments.values())
+
+def wait_for_generation(namespace: str, name: str, generation: int, timeout: float = 5) -> bool:
+    """
+    Wait until the cache holds at least a given generation of a Deployment.
+
+    Args:
+        namespace: The namespace of the deployment
+        name: The name of the deployment
+        generation: The metadata.generation to wait for
+        timeout: Maximum number of seconds to wait
+
+    Returns:
+        True if the generation was observed before the timeout
+    """
+    def observed() -> bool:
+        deployment = _deployments.get((namespace, name))
+        return deployment is not None and (deployment.metadata.generation or 0) >= generation
+
+    with _changed:
+        return _changed.wait_for(observed, timeout=timeout)
+
+def _relist(k8s_client: client.AppsV1Api) -> str:
+    """Replace the cache with a fresh LIST and return its resourceVersion."""
+    deployments = k8s_client.list_deployment_for_all_namespaces(
+        resource_version="0",
+        resource_version_match="NotOlderThan"
+    )
+
+    with _changed:
+        _deployments.clear()
+        for deployment in deployments.items:
+            _deployments[(deployment.metadata.namespace, deployment.metadata.name)] = deployment
+        _changed.notify_all()
+
+    _mark_synced()
+    logger.info(f"Informer synced {len(deployments.items)} deployments")
+    return deployments.metadata.resource_version
+
+def _run(client_factory: Callable[[], client.AppsV1Api]) -> None:
+    """LIST then WATCH deployments forever, relisting whenever the watch breaks."""
+    backoff = 1
+    while True:
+        try:
+            k8s_client = client_factory()
+            resource_version = _relist(k8s_client)
+
+            # Each watch resumes from the last seen resourceVersion and raises
+            # on 410 Gone, which sends us back to relist. The backoff is only
+            # reset once a watch has proven healthy, so a watch that keeps
+            # failing doesn't turn into a cluster-wide LIST every second
+            while True:
+                started = time.monotonic()
+                for event in watch.Watch().stream(
+                    k8s_client.list_deployment_for_all_namespaces,
+                    resource_version=resource_version,
+                    timeout_seconds=WATCH_TIMEOUT
+                ):
+                    deployment = event["object"]
+                    key = (deployment.metadata.namespace, deployment.metadata.name)
+                    with _changed:
+                        if event["type"] == "DELETED":
+                            _deployments.pop(key, None)
+                        else:
+                            _deployments[key] = deployment
+                        _changed.notify_all()
+                    resource_version = deployment.metadata.resource_version
+                    _mark_synced()
+                    backoff = 1
+
+                if time.monotonic() - started < MIN_WATCH_DURATION:
+                    logger.warning("Informer watch ended early, relisting deployments")
+                    break
+
+                # The watch ran until its timeout without an error
+                _mark_synced()
+                backoff = 1
+        except client.exceptions.ApiException as e:
+            if e.status == 410:
+                logger.info("Informer watch expired, relisting deployments")
+                continue
+            logger.error(f"Informer error watching deployments: {e}")
+        except Exception as e:
+            logger.error(f"Informer error: {e}")
+
+        time.sleep(backoff)
+        backoff = min(backoff * 2, MAX_BACKOFF)
@@ -6,21 +6,199 @@ and extracting intents and entities.
 """
 
 import os
+import re
+import pathlib
+import json
 import logging
-from typing import Dict, Any, List, Tuple
-import google.generativeai as genai
+import threading
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, Any, FrozenSet, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
 
 logger = logging.getLogger(__name__)
 
-# Initialize Google Gemini API
+# Google Gemini API configuration
 API_KEY = os.environ.get("GOOGLE_GEMINI_API_KEY")
-if API_KEY:
-    genai.configure(api_key=API_KEY)
+
+# JSON mode with a response schema needs a Gemini 1.5 model
+NLU_MODEL = os.environ.get("GEMINI_NLU_MODEL", "gemini-1.5-flash")
+
+INTENTS = [
+    "optimize_cpu",
+    "optimize_memory",
+    "optimize_both",
+    "get_usage",
+    "suggest_workloads",
+    "unknown"
+]
+
+_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "intent": {"type": "string", "format": "enum", "enum": INTENTS},
+        "entities": {
+            "type": "object",
+            "properties": {
+                "workload_name": {"type": "string"},
+                "namespace": {"type": "string"},
+                "direction": {"type": "string", "format": "enum", "enum": ["increase", "decrease"]},
+                "resource_type": {"type": "string", "format": "enum", "enum": ["cpu", "memory", "both"]},
+                "percentage": {"type": "string"}
+            }
+        }
+    },
+    "required": ["intent"]
+}
+
+# Ask for structured JSON output matching the schema
+_GENERATION_CONFIG = {
+    "response_mime_type": "application/json",
+    "response_schema": _RESPONSE_SCHEMA
+}
+
+_JSON_DECODER = json.JSONDecoder()
+
+# Invariant instructions, sent as the system instruction so each request only
+# carries the user's text
+_SYSTEM_PROMPT = (
+    (pathlib.Path(__file__).with_name("templates") / "nlu_system_prompt.txt").read_text().strip()
+)
+
+# Gemini SDK and model, loaded on first use so importing this module doesn't
+# pay for the SDK, and built once rather than per request
+_GENAI = None
+_MODEL = None
+_genai_lock = threading.Lock()
+
+def _get_genai():
+    """Import and configure the Gemini SDK on first use"""
+    global _GENAI
+    if _GENAI is None:
+        with _genai_lock:
+            if _GENAI is None:
+                import google.generativeai as genai
+                genai.configure(api_key=API_KEY)
+                _GENAI = genai
+    return _GENAI
+
+def _get_model():
+    """Get the shared Gemini model for intent and entity extraction"""
+    global _MODEL
+    if _MODEL is None:
+        genai = _get_genai()
+        with _genai_lock:
+            if _MODEL is None:
+                _MODEL = genai.GenerativeModel(
+                    NLU_MODEL,
+                    generation_config=_GENERATION_CONFIG,
+                    system_instruction=_SYSTEM_PROMPT
+                )
+    return _MODEL
+
+# Requests are classified by their nearest prototype utterance in embedding
+# space; Gemini is only asked when no prototype is close enough
+EMBEDDING_MODEL = os.environ.get("GEMINI_EMBEDDING_MODEL", "models/text-embedding-004")
+INTENT_SCORE_THRESHOLD = float(os.environ.get("NLU_INTENT_SCORE_THRESHOLD", "0.75"))
+
+_INTENT_PROTOTYPES: Dict[str, List[str]] = {
+    "optimize_cpu": [
+        "reduce cpu for frontend-service",
+        "decrease the cpu request of my deployment",
+        "lower cpu limits on the api server",
+        "cut cpu for checkout by 30%",
+        "increase cpu for the worker",
+        "give payments more cpu",
+        "optimize cpu usage of backend",
+        "my service is cpu throttled",
+        "right-size cpu for orders",
+        "scale down cpu on default/web"
+    ],
+    "optimize_memory": [
+        "reduce memory for frontend-service",
+        "decrease the memory request of my deployment",
+        "lower memory limits on the api server",
+        "cut memory for checkout by 20%",
+        "increase memory for the worker",
+        "my pod keeps getting oomkilled",
+        "optimize memory usage of backend",
+        "give the cache more ram",
+        "right-size memory for orders",
+        "shrink the heap allocation on default/web"
+    ],
+    "optimize_both": [
+        "reduce cpu and memory for frontend-service",
+        "optimize resources for my deployment",
+        "right-size the api server",
+        "lower requests and limits on checkout",
+        "tune cpu and memory on the worker",
+        "decrease all resources for payments by 25%",
+        "my deployment is over-provisioned",
+        "optimize both cpu and memory for orders",
+        "adjust resource requests and limits for backend",
+        "shrink the footprint of default/web"
+    ],
+    "get_usage": [
+        "show resource usage for frontend-service",
+        "how much cpu is my deployment using",
+        "what is the memory usage of the api server",
+        "show me usage trends for checkout",
+        "display resource consumption of the worker",
+        "how busy is payments",
+        "resource usage graph for orders",
+        "what are the current requests and limits of backend",
+        "show utilization for default/web",
+        "how much memory does the cache use"
+    ],
+    "suggest_workloads": [
+        "suggest workloads to optimize",
+        "recommend deployments to right-size",
+        "which services are over-provisioned",
+        "what can i optimize",
+        "find savings in the cluster",
+        "show optimization candidates",
+        "which deployments waste the most resources",
+        "give me recommendations",
+        "where can we reduce costs",
+        "list workloads that need tuning"
+    ]
+}
+
+_RESOURCE_TYPES = {
+    "optimize_cpu": "cpu",
+    "optimize_memory": "memory",
+    "optimize_both": "both"
+}
+
+_prototypes: Optional[Tuple[List[str], "np.ndarray"]] = None
+_prototypes_lock = threading.Lock()
+
+# Punctuation that doesn't change the meaning of a request; "/", "-", "%" and
+# "." appear in workload references and numbers so they are kept
+_NOISE_RE = re.compile(r"[^\w\s/%.-]")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Patterns and keywords for the rule-based fallback
+_WORKLOAD_RE = re.compile(r'(?:for|on)\s+(?:the\s+)?([a-zA-Z0-9-]+(?:/[a-zA-Z0-9-]+)?)')
+_PCT_RE = re.compile(r'(\d+)%')
+_DECREASE = ("reduce", "decrease")
+_INCREASE = ("increase", "raise")
+_USAGE = ("usage", "show")
+_SUGGEST = ("suggest", "recommend")
+
+def _normalize(text: str) -> str:
+    """Normalize input so trivially different phrasings share a cache entry"""
+    text = _NOISE_RE.sub("", text.lower())
+    return _WHITESPACE_RE.sub(" ", text).strip(" .")
 
 def process_natural_language(text: str) -> Tuple[str, Dict[str, Any]]:
     """
     Process natural language input to extract intent and entities.
     
+    Results are cached per normalized input, so repeated requests don't call
+    Gemini again.
+    
     Args:
         text: The natural language input from the user
         
@@ -30,102 +208,156 @@ def process_natural_language(text: str) -> Tuple[str, Dict[str, Any]]:
     logger.info(f"Processing natural language input: {text}")
     
     try:
-        # Use the Gemini model to extract intent and entities
-        if API_KEY:
-            model = genai.GenerativeModel('gemini-pro')
-            prompt = f"""
-            Extract the intent and entities from the following Kubernetes resource optimization request:
-            
-            "{text}"
-            
-            Possible intents:
-            - optimize_cpu: The user wants to optimize CPU resources
-            - optimize_memory: The user wants to optimize memory resources
-            - optimize_both: The user wants to optimize both CPU and memory resources
-            - get_usage: The user wants to see resource usage
-            - suggest_workloads: The user wants suggestions for optimization candidates
-            - unknown: The intent is not clear
-            
-            Possible entities:
-            - workload_name: The name of the Kubernetes workload
-            - namespace: The Kubernetes namespace
-            - direction: Whether to increase or decrease resources (increase, decrease)
-            - resource_type: The type of resource to optimize (cpu, memory, both)
-            - percentage: Any percentage mentioned
-            
-            Format your response as a JSON object with 'intent' and 'entities' fields.
-            For example:
-            {{
-                "intent": "optimize_cpu",
-                "entities": {{
-                    "workload_name": "frontend-service",
-                    "namespace": "default",
-                    "direction": "decrease",
-                    "resource_type": "cpu",
-                    "percentage": "50"
-                }}
-            }}
-            
-            If an entity is not present, omit it from the entities object.
-            """
-            
-            response = model.generate_content(prompt)
-            result = response.text
-            
-            # Parse the JSON result - in a production system we would add proper
-            # error handling and fallback for the JSON parsing
-            import json
-            import re
-            
-            # Find the JSON object in the response using regex
-            json_match = re.search(r'\{.*\}', result, re.DOTALL)
-            if json_match:
-                json_str = json_match.group(0)
-                parsed = json.loads(json_str)
-                intent = parsed.get("intent", "unknown")
-                entities = parsed.get("entities", {})
-                
-                logger.info(f"Extracted intent: {intent}, entities: {entities}")
-                return intent, entities
-        
-        # Fallback to simple rule-based parsing
-        intent = "unknown"
-        entities = {}
-        
-        # Extract workload name if present (assuming format "workload-name" or "namespace/workload-name")
-        import re
-        workload_match = re.search(r'(?:for|on)\s+(?:the\s+)?([a-zA-Z0-9-]+(?:/[a-zA-Z0-9-]+)?)', text)
-        if workload_match:
-            workload_ref = workload_match.group(1)
-            if "/" in workload_ref:
-                namespace, workload_name = workload_ref.split("/", 1)
-                entities["namespace"] = namespace
-                entities["workload_name"] = workload_name
-            else:
-                entities["workload_name"] = workload_ref
+        intent, entities = _classify(_normalize(text))
+        return intent, dict(entities)
+    except Exception as e:
+        logger.error(f"Error processing natural language input: {e}")
+        return "unknown", {}
+
+def _parse_json(result: str) -> Dict[str, Any]:
+    """
+    Parse the JSON object in a model response.
+    
+    In JSON mode the response is the object itself; decoding still starts at
+    the first brace so any stray text around the object is ignored.
+    
+    Raises:
+        ValueError: If the response doesn't contain a JSON object
+    """
+    start = result.find("{")
+    if start < 0:
+        raise ValueError("No JSON object in model response")
+    parsed, _ = _JSON_DECODER.raw_decode(result, start)
+    return parsed
+
+def _embed(texts: List[str]) -> "np.ndarray":
+    """Embed texts into a matrix of unit-length float32 rows"""
+    import numpy as np
+    result = _get_genai().embed_content(model=EMBEDDING_MODEL, content=texts, task_type="classification")
+    vectors = np.asarray(result["embedding"], dtype=np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+def _get_prototypes() -> Tuple[List[str], "np.ndarray"]:
+    """Return the prototype labels and embeddings, embedding them on first use"""
+    global _prototypes
+    if _prototypes is None:
+        with _prototypes_lock:
+            if _prototypes is None:
+                labels = [intent for intent, examples in _INTENT_PROTOTYPES.items() for _ in examples]
+                examples = [example for examples in _INTENT_PROTOTYPES.values() for example in examples]
+                _prototypes = (labels, _embed(examples))
+    return _prototypes
+
+def _nearest_intent(text: str) -> Tuple[str, float]:
+    """
+    Find the intent of the prototype utterance closest to the input.
+    
+    Returns:
+        A tuple containing the intent and its cosine similarity
+    """
+    labels, matrix = _get_prototypes()
+    scores = matrix @ _embed([text])[0]
+    best = int(scores.argmax())
+    return labels[best], float(scores[best])
+
+def _extract_entities(text: str) -> Dict[str, Any]:
+    """Extract the workload reference and percentage from the input"""
+    entities = {}
+    
+    # Extract workload name if present (assuming format "workload-name" or "namespace/workload-name")
+    workload_match = _WORKLOAD_RE.search(text)
+    if workload_match:
+        workload_ref = workload_match.group(1)
+        if "/" in workload_ref:
+            namespace, workload_name = workload_ref.split("/", 1)
+            entities["namespace"] = namespace
+            entities["workload_name"] = workload_name
+        else:
+            entities["workload_name"] = workload_ref
+    
+    # Extract percentage if present
+    percentage_match = _PCT_RE.search(text)
+    if percentage_match:
+        entities["percentage"] = percentage_match.group(1)
+    
+    return entities
+
+def _freeze(intent: str, entities: Dict[str, Any]) -> Tuple[str, FrozenSet[Tuple[str, Any]]]:
+    """
+    Make a classification hashable so it can be cached.
+
+    Missing (None or empty) entities are dropped so callers' defaults still
+    apply, and JSON scalars keep their type; only nested values are
+    converted to strings.
+    """
+    return intent, frozenset(
+        (key, value if isinstance(value, (str, int, float, bool)) else str(value))
+        for key, value in entities.items()
+        if value is not None and not (isinstance(value, (str, list, dict)) and not value)
+    )
+
+@lru_cache(maxsize=1024)
+def _classify(text: str) -> Tuple[str, FrozenSet[Tuple[str, Any]]]:
+    """
+    Extract intent and entities from normalized input.
+    
+    Args:
+        text: The normalized natural language input
         
-        # Determine the intent based on keywords
-        if "cpu" in text.lower() and ("reduce" in text.lower() or "decrease" in text.lower()):
-            intent = "optimize_cpu"
-            entities["direction"] = "decrease"
-            entities["resource_type"] = "cpu"
-        elif "memory" in text.lower() and ("reduce" in text.lower() or "decrease" in text.lower()):
-            intent = "optimize_memory"
-            entities["direction"] = "decrease"
-            entities["resource_type"] = "memory"
-        elif "resource" in text.lower() and ("usage" in text.lower() or "show" in text.lower()):
-            intent = "get_usage"
-        elif "suggest" in text.lower() or "recommend" in text.lower():
-            intent = "suggest_workloads"
+    Returns:
+        A tuple containing the intent and a frozenset of entity items
+    """
+    if API_KEY:
+        # Try the prototype classifier first; it costs one embedding call
+        try:
+            intent, score = _nearest_intent(text)
+        except Exception as e:
+            logger.warning(f"Embedding classification failed, using Gemini: {e}")
+        else:
+            if score >= INTENT_SCORE_THRESHOLD:
+                entities = _extract_entities(text)
+                if intent in _RESOURCE_TYPES:
+                    entities["resource_type"] = _RESOURCE_TYPES[intent]
+                    if any(word in text for word in _DECREASE):
+                        entities["direction"] = "decrease"
+                    elif any(word in text for word in _INCREASE):
+                        entities["direction"] = "increase"
+                
+                logger.info(f"Embedding classification - intent: {intent} ({score:.2f}), entities: {entities}")
+                return _freeze(intent, entities)
         
-        # Extract percentage if present
-        percentage_match = re.search(r'(\d+)%', text)
-        if percentage_match:
-            entities["percentage"] = percentage_match.group(1)
+        # Use the Gemini model to extract intent and entities
+        response = _get_model().generate_content(text)
         
-        logger.info(f"Simple rule-based extraction - intent: {intent}, entities: {entities}")
-        return intent, entities
+        try:
+            parsed = _parse_json(response.text)
+        except ValueError as e:
+            logger.warning(f"Could not parse model response, using rule-based parsing: {e}")
+        else:
+            intent = parsed.get("intent", "unknown")
+            entities = parsed.get("entities", {})
+            
+            logger.info(f"Extracted intent: {intent}, entities: {entities}")
+            return _freeze(intent, entities)
     
-    except Exception as e:
-        logger.error(f"Error processing natural language input: {e}")
-        return "unknown", {} 
\ No newline at end of file
+    # Fallback to simple rule-based parsing
+    intent = "unknown"
+    entities = _extract_entities(text)
+    
+    # Determine the intent based on keywords (the text is already lowercase)
+    decrease = any(word in text for word in _DECREASE)
+    if decrease and "cpu" in text:
+        intent = "optimize_cpu"
+        entities["direction"] = "decrease"
+        entities["resource_type"] = "cpu"
+    elif decrease and "memory" in text:
+        intent = "optimize_memory"
+        entities["direction"] = "decrease"
+        entities["resource_type"] = "memory"
+    elif "resource" in text and any(word in text for word in _USAGE):
+        intent = "get_usage"
+    elif any(word in text for word in _SUGGEST):
+        intent = "suggest_workloads"
+    
+    logger.info(f"Simple rule-based extraction - intent: {intent}, entities: {entities}")
+    return _freeze(intent, entities)
@@ -0,0 +1,58 @@
+"""
+Resource quantity parsing for GKE Resource Optimizer.
+
+This module contains the parser for Kubernetes resource quantity strings such
+as "500m", "1Gi" or "129e6", shared by the Kubernetes and AI services.
+"""
+
+import re
+import functools
+
+# A number followed by either a decimal exponent or an optional unit suffix
+_QUANTITY_RE = re.compile(
+    r'^\s*([-+]?(?:\d+(?:\.\d*)?|\.\d+))(?:[eE]([-+]?\d+)|([a-zA-Z]*))\s*$'
+)
+_QUANTITY_UNITS = {
+    "": 1,
+    "n": 1e-9,
+    "u": 1e-6,
+    "m": 1e-3,
+    "k": 1e3,
+    "M": 1e6,
+    "G": 1e9,
+    "T": 1e12,
+    "P": 1e15,
+    "E": 1e18,
+    "Ki": 1024,
+    "Mi": 1024 ** 2,
+    "Gi": 1024 ** 3,
+    "Ti": 1024 ** 4,
+    "Pi": 1024 ** 5,
+    "Ei": 1024 ** 6
+}
+
+@functools.lru_cache(maxsize=2048)
+def extract_numeric_value(value_str: str) -> float:
+    """
+    Extract the numeric value of a Kubernetes resource quantity string.
+    
+    Args:
+        value_str: The resource value string (e.g., "500m", "1Gi", "2", "129e6")
+        
+    Returns:
+        The numeric value in base units (cores for CPU, bytes for memory)
+        
+    Raises:
+        ValueError: If the value is not a quantity with a known unit suffix
+    """
+    match = _QUANTITY_RE.match(str(value_str))
+    if not match:
+        raise ValueError(f"Could not extract numeric value from {value_str}")
+    
+    number, exponent, suffix = match.groups()
+    if exponent is not None:
+        return float(number) * 10 ** int(exponent)
+    if suffix not in _QUANTITY_UNITS:
+        raise ValueError(f"Could not extract numeric value from {value_str}")
+    
+    return float(number) * _QUANTITY_UNITS[suffix]
@@ -0,0 +1,48 @@
+"""
+Rate limiting service for GKE Resource Optimizer.
+
+This module contains a per-user token bucket used to reject requests that
+would trigger expensive downstream calls (Gemini, Jira, Kubernetes) before
+any of that work starts.
+"""
+
+import os
+import time
+import logging
+import threading
+from typing import Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RATE = float(os.environ.get("RATE_LIMIT_PER_SECOND", "1.0"))
+DEFAULT_BURST = float(os.environ.get("RATE_LIMIT_BURST", "5"))
+
+# user_id -> (tokens, last_refill)
+_BUCKETS: Dict[str, Tuple[float, float]] = {}
+_lock = threading.Lock()
+
+def allow(user_id: str, rate: float = DEFAULT_RATE, burst: float = DEFAULT_BURST) -> bool:
+    """
+    Take a token from a user's bucket.
+
+    Args:
+        user_id: The Slack user ID
+        rate: Tokens added to the bucket per second
+        burst: Maximum number of tokens in the bucket
+
+    Returns:
+        True if the request is allowed, False if the user is rate limited
+    """
+    now = time.monotonic()
+
+    with _lock:
+        tokens, last_refill = _BUCKETS.get(user_id, (burst, now))
+        tokens = min(burst, tokens + (now - last_refill) * rate)
+
+        if tokens < 1:
+            _BUCKETS[user_id] = (tokens, now)
+            logger.warning(f"Rate limited user {user_id}")
+            return False
+
+        _BUCKETS[user_id] = (tokens - 1, now)
+        return True
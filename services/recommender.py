@@ -6,24 +6,112 @@ to get resource optimization recommendations for GKE workloads.
 """
 
 import os
+import re
 import logging
-from typing import Dict, Any, List
+import threading
+from typing import Dict, Any, Iterator, Optional, Tuple
 from google.cloud import recommender_v1
 from google.api_core.exceptions import GoogleAPIError
+from services.k8s import get_workload_details_many
 
 logger = logging.getLogger(__name__)
 
+_CLIENT: Optional[recommender_v1.RecommenderClient] = None
+_client_lock = threading.Lock()
+
 def get_recommender_client() -> recommender_v1.RecommenderClient:
-    """Initialize and return a Google Cloud Recommender client."""
-    return recommender_v1.RecommenderClient()
+    """Return the shared Google Cloud Recommender client, initializing it on first use."""
+    global _CLIENT
+    if _CLIENT is None:
+        with _client_lock:
+            if _CLIENT is None:
+                _CLIENT = recommender_v1.RecommenderClient()
+    return _CLIENT
+
+# Operation resource paths look like
+# //container.googleapis.com/projects/.../clusters/CLUSTER/k8s/namespaces/NS/apps/deployments/NAME
+_DEPLOYMENT_RESOURCE_RE = re.compile(r"/namespaces/([^/]+)/apps/deployments/([^/]+)$")
+
+# Recommendations fetched per API call; further pages are fetched lazily
+RECOMMENDATIONS_PAGE_SIZE = 100
+
+# Serve canned candidates for development without actual GCP integration
+DEV_STUB_ENABLED = os.environ.get("RECOMMENDER_DEV_STUB", "").lower() == "true"
 
-def suggest_optimization_candidates() -> List[Dict[str, Any]]:
+_DEV_STUB = [
+    {
+        "namespace": "default",
+        "workload_name": "frontend-service",
+        "current_resources": {
+            "cpu_request": "500m",
+            "cpu_limit": "1000m",
+            "memory_request": "512Mi",
+            "memory_limit": "1Gi"
+        },
+        "recommended_resources": {
+            "cpu_request": "250m",
+            "cpu_limit": "500m",
+            "memory_request": "256Mi",
+            "memory_limit": "512Mi"
+        },
+        "justification": "This workload has been consistently using less than 50% of its requested CPU and memory over the past 30 days.",
+        "priority": "HIGH",
+        "potential_savings": "$42.50 per month"
+    },
+    {
+        "namespace": "backend",
+        "workload_name": "api-service",
+        "current_resources": {
+            "cpu_request": "1000m",
+            "cpu_limit": "2000m",
+            "memory_request": "1Gi",
+            "memory_limit": "2Gi"
+        },
+        "recommended_resources": {
+            "cpu_request": "500m",
+            "cpu_limit": "1000m",
+            "memory_request": "512Mi",
+            "memory_limit": "1Gi"
+        },
+        "justification": "This workload has been consistently using less than 30% of its requested CPU and memory over the past 30 days.",
+        "priority": "MEDIUM",
+        "potential_savings": "$85.00 per month"
+    },
+    {
+        "namespace": "monitoring",
+        "workload_name": "prometheus",
+        "current_resources": {
+            "cpu_request": "250m",
+            "cpu_limit": "500m",
+            "memory_request": "1Gi",
+            "memory_limit": "2Gi"
+        },
+        "recommended_resources": {
+            "cpu_request": "250m",
+            "cpu_limit": "500m",
+            "memory_request": "2Gi",
+            "memory_limit": "3Gi"
+        },
+        "justification": "This workload has been consistently reaching its memory limits, causing restarts. Consider increasing memory allocation.",
+        "priority": "HIGH",
+        "potential_savings": "-$30.00 per month (cost increase, but improves reliability)"
+    }
+]
+
+def suggest_optimization_candidates() -> Iterator[Dict[str, Any]]:
     """
     Get workload resource optimization recommendations from Google Cloud Recommender.
     
-    Returns:
-        A list of workload candidates with optimization recommendations.
+    Candidates are yielded as the pager fetches them, so recommendations are
+    never all held in memory at once.
+    
+    Yields:
+        Workload candidates with optimization recommendations.
     """
+    if DEV_STUB_ENABLED:
+        yield from _DEV_STUB
+        return
+    
     client = get_recommender_client()
     project_id = os.environ.get("GCP_PROJECT_ID")
     location = os.environ.get("K8S_LOCATION")
@@ -38,110 +126,89 @@ def suggest_optimization_candidates() -> List[Dict[str, Any]]:
     try:
         # In a real implementation, we would filter recommendations for the specific cluster
         # and for resource optimization (CPU and memory)
-        recommendations = client.list_recommendations(parent=parent)
-        
-        candidates = []
-        for recommendation in recommendations:
-            # Extract the relevant information from the recommendation
-            if "resourceContainer" in recommendation.content and "operationGroups" in recommendation.content:
-                resource_container = recommendation.content.resource_container
-                operation_groups = recommendation.content.operation_groups
-                
-                # Parse the recommendation details
-                # This is a simplified version, in a real implementation we would parse the
-                # recommendation content based on the specific format of the Recommender API
-                
-                namespace = "default"  # Placeholder
-                workload_name = "some-workload"  # Placeholder
-                
-                # Extract the recommended resources
-                recommended_resources = {
-                    "cpu_request": "250m",  # Placeholder
-                    "cpu_limit": "500m",  # Placeholder
-                    "memory_request": "256Mi",  # Placeholder
-                    "memory_limit": "512Mi"  # Placeholder
-                }
-                
-                # Extract the justification
-                justification = recommendation.description
-                
-                candidates.append({
-                    "namespace": namespace,
-                    "workload_name": workload_name,
-                    "current_resources": {
-                        "cpu_request": "500m",  # Placeholder
-                        "cpu_limit": "1000m",  # Placeholder
-                        "memory_request": "512Mi",  # Placeholder
-                        "memory_limit": "1Gi"  # Placeholder
-                    },
-                    "recommended_resources": recommended_resources,
-                    "justification": justification,
-                    "priority": "HIGH"  # Placeholder
-                })
+        recommendations = client.list_recommendations(
+            request={"parent": parent, "page_size": RECOMMENDATIONS_PAGE_SIZE}
+        )
         
-        return candidates
+        for page in recommendations.pages:
+            # Pair each recommendation with the deployment it targets
+            targets = []
+            for recommendation in page.recommendations:
+                workload = _target_workload(recommendation)
+                if workload:
+                    targets.append((workload, recommendation))
+            
+            # Look up the current resources for the whole page concurrently
+            details = get_workload_details_many(
+                [workload for workload, _ in targets],
+                return_exceptions=True
+            )
+            
+            for ((namespace, workload_name), recommendation), workload_details in zip(targets, details):
+                yield _to_candidate(namespace, workload_name, recommendation, workload_details)
     except GoogleAPIError as e:
         logger.error(f"Error getting recommendations from Google Cloud Recommender: {e}")
         raise
+
+def _target_workload(recommendation: recommender_v1.Recommendation) -> Optional[Tuple[str, str]]:
+    """
+    Find the deployment a recommendation applies to.
     
-    # Placeholder for development without actual GCP integration
-    # In a real implementation, this would be replaced with actual API calls
-    return [
-        {
-            "namespace": "default",
-            "workload_name": "frontend-service",
-            "current_resources": {
-                "cpu_request": "500m",
-                "cpu_limit": "1000m",
-                "memory_request": "512Mi",
-                "memory_limit": "1Gi"
-            },
-            "recommended_resources": {
-                "cpu_request": "250m",
-                "cpu_limit": "500m",
-                "memory_request": "256Mi",
-                "memory_limit": "512Mi"
-            },
-            "justification": "This workload has been consistently using less than 50% of its requested CPU and memory over the past 30 days.",
-            "priority": "HIGH",
-            "potential_savings": "$42.50 per month"
-        },
-        {
-            "namespace": "backend",
-            "workload_name": "api-service",
-            "current_resources": {
-                "cpu_request": "1000m",
-                "cpu_limit": "2000m",
-                "memory_request": "1Gi",
-                "memory_limit": "2Gi"
-            },
-            "recommended_resources": {
-                "cpu_request": "500m",
-                "cpu_limit": "1000m",
-                "memory_request": "512Mi",
-                "memory_limit": "1Gi"
-            },
-            "justification": "This workload has been consistently using less than 30% of its requested CPU and memory over the past 30 days.",
-            "priority": "MEDIUM",
-            "potential_savings": "$85.00 per month"
-        },
-        {
-            "namespace": "monitoring",
-            "workload_name": "prometheus",
-            "current_resources": {
-                "cpu_request": "250m",
-                "cpu_limit": "500m",
-                "memory_request": "1Gi",
-                "memory_limit": "2Gi"
-            },
-            "recommended_resources": {
-                "cpu_request": "250m",
-                "cpu_limit": "500m",
-                "memory_request": "2Gi",
-                "memory_limit": "3Gi"
-            },
-            "justification": "This workload has been consistently reaching its memory limits, causing restarts. Consider increasing memory allocation.",
-            "priority": "HIGH",
-            "potential_savings": "-$30.00 per month (cost increase, but improves reliability)"
+    Returns:
+        A (namespace, workload_name) pair, or None if no operation targets a deployment
+    """
+    for operation_group in recommendation.content.operation_groups:
+        for operation in operation_group.operations:
+            match = _DEPLOYMENT_RESOURCE_RE.search(operation.resource)
+            if match:
+                return match.group(1), match.group(2)
+    return None
+
+def _to_candidate(
+    namespace: str,
+    workload_name: str,
+    recommendation: recommender_v1.Recommendation,
+    workload_details: Any
+) -> Dict[str, Any]:
+    """
+    Build an optimization candidate from a recommendation.
+    
+    Args:
+        namespace: The namespace of the workload
+        workload_name: The name of the workload
+        recommendation: The recommendation from Google Cloud Recommender
+        workload_details: The workload details, or the exception raised looking them up
+        
+    Returns:
+        The candidate dictionary
+    """
+    current_resources = {}
+    if isinstance(workload_details, Exception):
+        logger.warning(f"Could not get current resources for {namespace}/{workload_name}: {workload_details}")
+    else:
+        resources = workload_details["resources"]
+        current_resources = {
+            "cpu_request": resources["requests"]["cpu"],
+            "cpu_limit": resources["limits"]["cpu"],
+            "memory_request": resources["requests"]["memory"],
+            "memory_limit": resources["limits"]["memory"]
         }
-    ] 
\ No newline at end of file
+    
+    # Parse the recommendation details
+    # This is a simplified version, in a real implementation we would parse the
+    # recommendation content based on the specific format of the Recommender API
+    recommended_resources = {
+        "cpu_request": "250m",  # Placeholder
+        "cpu_limit": "500m",  # Placeholder
+        "memory_request": "256Mi",  # Placeholder
+        "memory_limit": "512Mi"  # Placeholder
+    }
+    
+    return {
+        "namespace": namespace,
+        "workload_name": workload_name,
+        "current_resources": current_resources,
+        "recommended_resources": recommended_resources,
+        "justification": recommendation.description,
+        "priority": "HIGH"  # Placeholder
+    }
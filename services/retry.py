@@ -0,0 +1,30 @@
+"""
+Retry helpers for GKE Resource Optimizer.
+
+This module contains helpers for clients that back off and retry rate
+limited API calls.
+"""
+
+from typing import Any, Mapping, Optional
+
+def retry_after(headers: Optional[Mapping[str, Any]], default: float) -> float:
+    """
+    Return the delay requested by a Retry-After header.
+    
+    The header is looked up case-insensitively. HTTP-date and other
+    non-numeric values fall back to the caller's own backoff delay.
+    
+    Args:
+        headers: The response headers, if any
+        default: The delay to use if the header is missing or not a number of seconds
+        
+    Returns:
+        The number of seconds to wait
+    """
+    for name, value in (headers or {}).items():
+        if name.lower() == "retry-after":
+            try:
+                return max(float(value), 0)
+            except (TypeError, ValueError):
+                return default
+    return default
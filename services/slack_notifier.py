@@ -6,11 +6,114 @@ to Slack channels.
 """
 
 import os
+import json
+import time
+import atexit
+import queue
 import logging
-from typing import Dict, Any
+import threading
+from typing import Dict, Any, Optional, Set, Tuple
+from slack_sdk.errors import SlackApiError
+from services.retry import retry_after as parse_retry_after
 
 logger = logging.getLogger(__name__)
 
+QUEUE_MAXSIZE = 2048
+WORKER_COUNT = 2
+MAX_RETRIES = 5
+DRAIN_TIMEOUT = 10
+
+_queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=QUEUE_MAXSIZE)
+
+# Keys of the messages waiting in the queue, so an identical message isn't
+# queued twice
+_pending: Set[Tuple[Any, ...]] = set()
+_pending_lock = threading.Lock()
+
+# Blocks that are the same in every notification, built once and shared.
+# The SDK only serializes blocks, so sharing them between messages is safe.
+_DIVIDER_BLOCK = {
+    "type": "divider"
+}
+_FOOTER_BLOCK = {
+    "type": "context",
+    "elements": [
+        {
+            "type": "mrkdwn",
+            "text": "This optimization was performed by the GKE Resource Optimizer."
+        }
+    ]
+}
+
+def post_message(slack_client, fallback: Optional[Dict[str, Any]] = None, **kwargs) -> None:
+    """
+    Queue a chat.postMessage call to be sent by the background workers.
+    
+    A message identical to one already waiting (same channel, text and
+    blocks) is skipped. If the queue is full the oldest queued message is
+    dropped to make room.
+    
+    Args:
+        slack_client: The Slack client
+        fallback: Optional chat.postMessage arguments to send if the message fails
+        **kwargs: Arguments for chat.postMessage
+    """
+    key = _message_key(kwargs)
+    job = {"slack_client": slack_client, "kwargs": kwargs, "fallback": fallback, "key": key}
+    
+    with _pending_lock:
+        if key in _pending:
+            logger.info(f"Skipped duplicate message to channel {kwargs.get('channel')}")
+            return
+        
+        while True:
+            try:
+                _queue.put_nowait(job)
+                _pending.add(key)
+                return
+            except queue.Full:
+                try:
+                    dropped = _queue.get_nowait()
+                    _pending.discard(dropped["key"])
+                    _queue.task_done()
+                    logger.warning(f"Slack queue full, dropped message to {dropped['kwargs'].get('channel')}")
+                except queue.Empty:
+                    pass
+
+def _message_key(kwargs: Dict[str, Any]) -> Tuple[Any, ...]:
+    """Build the key identifying duplicate messages"""
+    blocks = kwargs.get("blocks")
+    if blocks is not None and not isinstance(blocks, str):
+        blocks = json.dumps(blocks, sort_keys=True, default=str)
+    return kwargs.get("channel"), kwargs.get("text"), blocks
+
+def depth() -> int:
+    """Return the number of messages waiting in the queue."""
+    return _queue.qsize()
+
+def drain(timeout: float = DRAIN_TIMEOUT) -> bool:
+    """
+    Wait for queued messages to be sent.
+    
+    Registered with atexit so notifications queued before a shutdown (e.g. a
+    SIGTERM during a rollout) are still delivered.
+    
+    Args:
+        timeout: Maximum number of seconds to wait
+        
+    Returns:
+        True if the queue was emptied before the timeout
+    """
+    deadline = time.monotonic() + timeout
+    with _queue.all_tasks_done:
+        while _queue.unfinished_tasks:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.warning(f"Shutting down with {_queue.unfinished_tasks} Slack messages unsent")
+                return False
+            _queue.all_tasks_done.wait(remaining)
+    return True
+
 def notify_resource_change(
     slack_client,
     channel: str,
@@ -20,7 +123,7 @@ def notify_resource_change(
     jira_ticket: Any
 ) -> None:
     """
-    Send a notification about a resource change to a Slack channel.
+    Queue a notification about a resource change to a Slack channel.
     
     Args:
         slack_client: The Slack client
@@ -31,6 +134,7 @@ def notify_resource_change(
         jira_ticket: The Jira ticket object
     """
     notification_channel = os.environ.get("NOTIFICATION_CHANNEL", channel)
+    title = f"GKE Resource Optimization: {namespace}/{workload_name}"
     
     try:
         # Create the notification message
@@ -39,13 +143,11 @@ def notify_resource_change(
                 "type": "header",
                 "text": {
                     "type": "plain_text",
-                    "text": f"GKE Resource Optimization: {namespace}/{workload_name}",
+                    "text": title,
                     "emoji": True
                 }
             },
-            {
-                "type": "divider"
-            },
+            _DIVIDER_BLOCK,
             {
                 "type": "section",
                 "text": {
@@ -60,35 +162,64 @@ def notify_resource_change(
                     "text": f"*Justification:*\n{justification}"
                 }
             },
-            {
-                "type": "context",
-                "elements": [
-                    {
-                        "type": "mrkdwn",
-                        "text": f"This optimization was performed by the GKE Resource Optimizer."
-                    }
-                ]
-            }
+            _FOOTER_BLOCK
         ]
         
-        # Send the notification
-        slack_client.chat_postMessage(
+        # Queue the notification, with a plain text version in case the blocks are rejected
+        post_message(
+            slack_client,
             channel=notification_channel,
             blocks=blocks,
-            text=f"GKE Resource Optimization: {namespace}/{workload_name}"
+            text=title,
+            fallback={
+                "channel": notification_channel,
+                "text": f"{title}\n"
+                        f"Jira Ticket: {jira_ticket.key}\n"
+                        f"Justification: {justification}"
+            }
         )
         
-        logger.info(f"Sent notification to channel {notification_channel}")
+        logger.info(f"Queued notification to channel {notification_channel}")
     except Exception as e:
-        logger.error(f"Error sending Slack notification: {e}")
-        
-        # Try to send a simplified notification if the block format fails
+        logger.error(f"Error queueing Slack notification: {e}")
+
+def _send(slack_client, kwargs: Dict[str, Any]) -> None:
+    """Send a message, backing off and retrying while Slack rate limits us."""
+    delay = 1.0
+    for attempt in range(MAX_RETRIES + 1):
         try:
-            slack_client.chat_postMessage(
-                channel=notification_channel,
-                text=f"GKE Resource Optimization: {namespace}/{workload_name}\n"
-                     f"Jira Ticket: {jira_ticket.key}\n"
-                     f"Justification: {justification}"
-            )
-        except Exception as e2:
-            logger.error(f"Error sending simplified Slack notification: {e2}") 
\ No newline at end of file
+            slack_client.chat_postMessage(**kwargs)
+            return
+        except SlackApiError as e:
+            if e.response.status_code != 429 or attempt == MAX_RETRIES:
+                raise
+            retry_after = parse_retry_after(e.response.headers, delay)
+            logger.warning(f"Slack rate limited, retrying in {retry_after}s")
+            time.sleep(retry_after)
+            delay *= 2
+
+def _worker() -> None:
+    """Send queued messages until the process exits."""
+    while True:
+        job = _queue.get()
+        with _pending_lock:
+            _pending.discard(job["key"])
+        try:
+            _send(job["slack_client"], job["kwargs"])
+            logger.info(f"Sent message to channel {job['kwargs'].get('channel')}")
+        except Exception as e:
+            logger.error(f"Error sending Slack message: {e}")
+            
+            # Try to send a simplified message if the original failed
+            if job["fallback"]:
+                try:
+                    _send(job["slack_client"], job["fallback"])
+                except Exception as e2:
+                    logger.error(f"Error sending simplified Slack message: {e2}")
+        finally:
+            _queue.task_done()
+
+for _i in range(WORKER_COUNT):
+    threading.Thread(target=_worker, name=f"slack-worker-{_i}", daemon=True).start()
+
+atexit.register(drain)
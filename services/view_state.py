@@ -0,0 +1,68 @@
+"""
+View state store for GKE Resource Optimizer.
+
+This module contains a small in-memory store for the state carried between
+Slack modal steps. Modals only carry the store ID in `private_metadata`, which
+keeps large values such as justifications out of Slack's 3000 character limit.
+"""
+
+import time
+import uuid
+import logging
+import threading
+from typing import Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+VIEW_STATE_TTL = 600
+
+_STORE: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+_lock = threading.Lock()
+
+def _purge_expired(now: float) -> None:
+    """Drop expired entries. Must be called with the lock held."""
+    expired = [state_id for state_id, (expires_at, _) in _STORE.items() if expires_at <= now]
+    for state_id in expired:
+        del _STORE[state_id]
+
+def put(payload: Dict[str, Any]) -> str:
+    """
+    Store a modal payload.
+
+    Args:
+        payload: The state to carry to the next modal step
+
+    Returns:
+        The ID to put in the modal's private_metadata
+    """
+    state_id = uuid.uuid4().hex
+    now = time.monotonic()
+
+    with _lock:
+        _purge_expired(now)
+        _STORE[state_id] = (now + VIEW_STATE_TTL, payload)
+
+    return state_id
+
+def pop(state_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Remove and return a stored modal payload.
+
+    Args:
+        state_id: The ID returned by `put`
+
+    Returns:
+        The stored payload, or None if it is unknown or expired
+    """
+    with _lock:
+        entry = _STORE.pop(state_id, None)
+
+    if entry is None:
+        return None
+
+    expires_at, payload = entry
+    if expires_at <= time.monotonic():
+        logger.info(f"View state {state_id} expired")
+        return None
+
+    return payload
@@ -4,8 +4,156 @@ Slack Block Kit templates for GKE Resource Optimizer.
 This module contains functions for building interactive Slack message blocks.
 """
 
-import json
-from typing import Dict, Any, List, Optional
+import string
+import functools
+from types import MappingProxyType
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import orjson
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    import json
+
+    _dumps = json.dumps
+
+# Read-only default for missing nested dictionaries
+_EMPTY = MappingProxyType({})
+
+# Static blocks shared by every message. The Slack SDK only serializes
+# blocks, so the same dicts can be referenced from many messages.
+_DIVIDER = {
+    "type": "divider"
+}
+
+_OPTIMIZATION_HEADER = {
+    "type": "header",
+    "text": {
+        "type": "plain_text",
+        "text": "GKE Resource Optimization",
+        "emoji": True
+    }
+}
+
+_OPTIMIZATION_INTRO = {
+    "type": "section",
+    "text": {
+        "type": "mrkdwn",
+        "text": "Let's optimize your GKE workload resources. Please provide the following details:"
+    }
+}
+
+_SUGGESTION_HEADER = {
+    "type": "header",
+    "text": {
+        "type": "plain_text",
+        "text": "Suggested Workloads for Optimization",
+        "emoji": True
+    }
+}
+
+_SUGGESTION_INTRO = {
+    "type": "section",
+    "text": {
+        "type": "mrkdwn",
+        "text": "Here are some workloads that could benefit from resource optimization:"
+    }
+}
+
+# Slack rejects messages with more than 50 blocks. Suggestions use three for
+# the header, two per candidate and one for the truncation notice.
+MAX_BLOCKS = 50
+MAX_SUGGESTIONS = (MAX_BLOCKS - 4) // 2
+
+_SUGGESTIONS_TRUNCATED = {
+    "type": "context",
+    "elements": [
+        {
+            "type": "mrkdwn",
+            "text": f"Showing the first {MAX_SUGGESTIONS} suggestions."
+        }
+    ]
+}
+
+# Button prototypes; per-request buttons only add their value
+_GET_WORKLOAD_BUTTON = {
+    "type": "button",
+    "text": {
+        "type": "plain_text",
+        "text": "Get Workload",
+        "emoji": True
+    },
+    "action_id": "get_workload_btn"
+}
+
+_SUGGEST_WORKLOADS_BUTTON = {
+    "type": "button",
+    "text": {
+        "type": "plain_text",
+        "text": "Suggest Workloads",
+        "emoji": True
+    },
+    "value": _dumps({
+        "action": "suggest_workloads"
+    }),
+    "action_id": "suggest_workloads_btn"
+}
+
+_OPTIMIZE_BUTTON = {
+    "type": "button",
+    "text": {
+        "type": "plain_text",
+        "text": "Optimize",
+        "emoji": True
+    },
+    "action_id": "optimize_workload_btn"
+}
+
+_OPTIMIZE_RESOURCES_BUTTON = {
+    **_OPTIMIZE_BUTTON,
+    "text": {
+        "type": "plain_text",
+        "text": "Optimize Resources",
+        "emoji": True
+    }
+}
+
+_CPU_OPTION = {
+    "value": "cpu",
+    "text": {
+        "type": "plain_text",
+        "text": "CPU Only"
+    }
+}
+_MEMORY_OPTION = {
+    "value": "memory",
+    "text": {
+        "type": "plain_text",
+        "text": "Memory Only"
+    }
+}
+_BOTH_OPTION = {
+    "value": "both",
+    "text": {
+        "type": "plain_text",
+        "text": "Both CPU and Memory"
+    }
+}
+_RESOURCE_TYPE_OPTIONS = (_CPU_OPTION, _MEMORY_OPTION, _BOTH_OPTION)
+
+# Slack requires the initial option to be identical to one of the options
+_INITIAL_BY_RT = {
+    "cpu": _CPU_OPTION,
+    "memory": _MEMORY_OPTION,
+    "both": _BOTH_OPTION
+}
+
+_RESOURCE_TYPE_LABEL = {
+    "type": "mrkdwn",
+    "text": "*Resource Type*"
+}
 
 def build_optimization_request_blocks(intent: Optional[str], entities: Dict[str, Any]) -> List[Dict[str, Any]]:
     """
@@ -18,114 +166,107 @@ def build_optimization_request_blocks(intent: Optional[str], entities: Dict[str,
     Returns:
         A list of Slack blocks
     """
-    workload_name = entities.get("workload_name", "")
-    namespace = entities.get("namespace", "default")
-    resource_type = entities.get("resource_type", "both")
-    direction = entities.get("direction", "")
+    return list(_build_optimization_request_blocks(*_optimization_request_values(entities)))
+
+def build_optimization_request_blocks_json(intent: Optional[str], entities: Dict[str, Any]) -> str:
+    """
+    Build Slack blocks for an optimization request as a JSON string.
     
-    blocks = [
-        {
-            "type": "header",
-            "text": {
-                "type": "plain_text",
-                "text": "GKE Resource Optimization",
-                "emoji": True
-            }
-        },
-        {
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": "Let's optimize your GKE workload resources. Please provide the following details:"
-            }
-        },
-        {
-            "type": "divider"
-        }
-    ]
+    The blocks match `build_optimization_request_blocks`, but are rendered
+    from a template serialized once at import, so only the user-supplied
+    values are encoded per call. The result can be passed as `blocks` to
+    chat.postMessage.
     
-    # Input for namespace
-    blocks.append({
+    Args:
+        intent: The extracted intent from NLU
+        entities: The extracted entities from NLU
+        
+    Returns:
+        The Slack blocks as a JSON array string
+    """
+    namespace, workload_name, resource_type = _optimization_request_values(entities)
+    template = _OPTIMIZATION_REQUEST_TEMPLATES.get(resource_type, _OPTIMIZATION_REQUEST_TEMPLATES[None])
+    return template.substitute(
+        namespace=_dumps(namespace),
+        namespace_nested=_dumps_nested(namespace),
+        workload_name=_dumps(workload_name),
+        workload_name_nested=_dumps_nested(workload_name)
+    )
+
+def _optimization_request_values(entities: Dict[str, Any]) -> Tuple[str, str, str]:
+    """Extract the namespace, workload name and resource type for an optimization request"""
+    get = entities.get
+    workload_name = get("workload_name") or ""
+    namespace = get("namespace") or "default"
+    resource_type = get("resource_type", "both")
+    return namespace, workload_name, resource_type
+
+def _dumps_nested(value: str) -> str:
+    """Encode a string as it appears inside a JSON value that is itself a JSON string"""
+    return _dumps(_dumps(value))[1:-1]
+
+def _make_input(
+    block_id: str,
+    action_id: str,
+    initial_value: str,
+    placeholder: str,
+    label: str
+) -> Dict[str, Any]:
+    """Build a plain text input block"""
+    return {
         "type": "input",
-        "block_id": "namespace_block",
+        "block_id": block_id,
         "element": {
             "type": "plain_text_input",
-            "action_id": "namespace_input",
-            "initial_value": namespace if namespace else "default",
+            "action_id": action_id,
+            "initial_value": initial_value,
             "placeholder": {
                 "type": "plain_text",
-                "text": "Enter the namespace"
+                "text": placeholder
             }
         },
         "label": {
             "type": "plain_text",
-            "text": "Namespace",
+            "text": label,
             "emoji": True
         }
-    })
+    }
+
+@functools.lru_cache(maxsize=1024)
+def _build_optimization_request_blocks(
+    namespace: str,
+    workload_name: str,
+    resource_type: str
+) -> Tuple[Dict[str, Any], ...]:
+    """
+    Build the optimization request blocks from already extracted values.
+    
+    Cached, since the same workload is often requested repeatedly; the
+    returned blocks are shared and must not be modified.
+    """
+    blocks = [_OPTIMIZATION_HEADER, _OPTIMIZATION_INTRO, _DIVIDER]
+    
+    # Input for namespace
+    blocks.append(_make_input("namespace_block", "namespace_input", namespace, "Enter the namespace", "Namespace"))
     
     # Input for workload name
-    blocks.append({
-        "type": "input",
-        "block_id": "workload_block",
-        "element": {
-            "type": "plain_text_input",
-            "action_id": "workload_input",
-            "initial_value": workload_name if workload_name else "",
-            "placeholder": {
-                "type": "plain_text",
-                "text": "Enter the workload name"
-            }
-        },
-        "label": {
-            "type": "plain_text",
-            "text": "Workload Name",
-            "emoji": True
-        }
-    })
+    blocks.append(_make_input("workload_block", "workload_input", workload_name, "Enter the workload name", "Workload Name"))
     
     # Radio buttons for resource type
+    radio_buttons = {
+        "type": "radio_buttons",
+        "action_id": "resource_type_selection",
+        "options": _RESOURCE_TYPE_OPTIONS
+    }
+    initial_option = _INITIAL_BY_RT.get(resource_type)
+    if initial_option:
+        radio_buttons["initial_option"] = initial_option
+    
     blocks.append({
         "type": "section",
         "block_id": "resource_type_block",
-        "text": {
-            "type": "mrkdwn",
-            "text": "*Resource Type*"
-        },
-        "accessory": {
-            "type": "radio_buttons",
-            "action_id": "resource_type_selection",
-            "initial_option": {
-                "value": resource_type,
-                "text": {
-                    "type": "plain_text",
-                    "text": resource_type.capitalize()
-                }
-            } if resource_type in ["cpu", "memory", "both"] else None,
-            "options": [
-                {
-                    "value": "cpu",
-                    "text": {
-                        "type": "plain_text",
-                        "text": "CPU Only"
-                    }
-                },
-                {
-                    "value": "memory",
-                    "text": {
-                        "type": "plain_text",
-                        "text": "Memory Only"
-                    }
-                },
-                {
-                    "value": "both",
-                    "text": {
-                        "type": "plain_text",
-                        "text": "Both CPU and Memory"
-                    }
-                }
-            ]
-        }
+        "text": _RESOURCE_TYPE_LABEL,
+        "accessory": radio_buttons
     })
     
     # Buttons for getting workload or fetching suggestions
@@ -133,35 +274,38 @@ def build_optimization_request_blocks(intent: Optional[str], entities: Dict[str,
         "type": "actions",
         "elements": [
             {
-                "type": "button",
-                "text": {
-                    "type": "plain_text",
-                    "text": "Get Workload",
-                    "emoji": True
-                },
-                "value": json.dumps({
+                **_GET_WORKLOAD_BUTTON,
+                "value": _dumps({
                     "action": "get_workload",
                     "namespace": namespace,
                     "workload": workload_name
-                }),
-                "action_id": "get_workload_btn"
+                })
             },
-            {
-                "type": "button",
-                "text": {
-                    "type": "plain_text",
-                    "text": "Suggest Workloads",
-                    "emoji": True
-                },
-                "value": json.dumps({
-                    "action": "suggest_workloads"
-                }),
-                "action_id": "suggest_workloads_btn"
-            }
+            _SUGGEST_WORKLOADS_BUTTON
         ]
     })
     
-    return blocks
+    return tuple(blocks)
+
+def _build_optimization_request_template(resource_type: Optional[str]) -> string.Template:
+    """Serialize the optimization request blocks with placeholders for the user values"""
+    namespace, workload_name = "__NAMESPACE__", "__WORKLOAD_NAME__"
+    text = _dumps(_build_optimization_request_blocks(namespace, workload_name, resource_type)).replace("$", "$$")
+    
+    # The button values are JSON strings inside JSON, so they hold the values
+    # encoded twice; replace those first
+    for sentinel, name in ((namespace, "namespace"), (workload_name, "workload_name")):
+        text = text.replace(_dumps_nested(sentinel), f"${{{name}_nested}}")
+        text = text.replace(_dumps(sentinel), f"${{{name}}}")
+    
+    return string.Template(text)
+
+# Only the radio button's initial option depends on the resource type, so one
+# template per option covers every request; None covers unrecognized types
+_OPTIMIZATION_REQUEST_TEMPLATES = {
+    resource_type: _build_optimization_request_template(resource_type)
+    for resource_type in ("cpu", "memory", "both", None)
+}
 
 def build_resource_usage_blocks(namespace: str, workload_name: str, usage_data: Dict[str, Any]) -> List[Dict[str, Any]]:
     """
@@ -184,36 +328,38 @@ def build_resource_usage_blocks(namespace: str, workload_name: str, usage_data:
                 "emoji": True
             }
         },
-        {
-            "type": "divider"
-        }
+        _DIVIDER
     ]
     
     # CPU usage
-    cpu_data = usage_data.get("cpu", {})
+    cpu = (usage_data.get("cpu") or _EMPTY).get
     blocks.append({
         "type": "section",
         "text": {
             "type": "mrkdwn",
-            "text": f"*CPU Usage*\n"
-                   f"Current: {cpu_data.get('current', 'N/A')}\n"
-                   f"Request: {cpu_data.get('request', 'N/A')}\n"
-                   f"Limit: {cpu_data.get('limit', 'N/A')}\n"
-                   f"Usage: {cpu_data.get('usage_percentage', 0)}%"
+            "text": "\n".join((
+                "*CPU Usage*",
+                f"Current: {cpu('current', 'N/A')}",
+                f"Request: {cpu('request', 'N/A')}",
+                f"Limit: {cpu('limit', 'N/A')}",
+                f"Usage: {cpu('usage_percentage', 0)}%"
+            ))
         }
     })
     
     # Memory usage
-    memory_data = usage_data.get("memory", {})
+    memory = (usage_data.get("memory") or _EMPTY).get
     blocks.append({
         "type": "section",
         "text": {
             "type": "mrkdwn",
-            "text": f"*Memory Usage*\n"
-                   f"Current: {memory_data.get('current', 'N/A')}\n"
-                   f"Request: {memory_data.get('request', 'N/A')}\n"
-                   f"Limit: {memory_data.get('limit', 'N/A')}\n"
-                   f"Usage: {memory_data.get('usage_percentage', 0)}%"
+            "text": "\n".join((
+                "*Memory Usage*",
+                f"Current: {memory('current', 'N/A')}",
+                f"Request: {memory('request', 'N/A')}",
+                f"Limit: {memory('limit', 'N/A')}",
+                f"Usage: {memory('usage_percentage', 0)}%"
+            ))
         }
     })
     
@@ -222,104 +368,145 @@ def build_resource_usage_blocks(namespace: str, workload_name: str, usage_data:
         "type": "actions",
         "elements": [
             {
-                "type": "button",
-                "text": {
-                    "type": "plain_text",
-                    "text": "Optimize Resources",
-                    "emoji": True
-                },
-                "value": json.dumps({
+                **_OPTIMIZE_RESOURCES_BUTTON,
+                "value": _dumps({
                     "namespace": namespace,
                     "workload": workload_name
-                }),
-                "action_id": "optimize_workload_btn"
+                })
             }
         ]
     })
     
     return blocks
 
-def build_workload_suggestion_blocks(candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def build_resource_usage_blocks_json(namespace: str, workload_name: str, usage_data: Dict[str, Any]) -> str:
+    """
+    Build Slack blocks for displaying resource usage as a JSON string.
+    
+    The result can be passed as `blocks` to chat.postMessage, which sends it
+    as is instead of encoding the block list again.
+    
+    Args:
+        namespace: The namespace of the workload
+        workload_name: The name of the workload
+        usage_data: The resource usage data
+        
+    Returns:
+        The Slack blocks as a JSON array string
+    """
+    return _dumps(build_resource_usage_blocks(namespace, workload_name, usage_data))
+
+def build_workload_suggestion_blocks(candidates: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
     Build Slack blocks for displaying workload optimization suggestions.
     
     Args:
-        candidates: The list of workload candidates for optimization
+        candidates: The workload candidates for optimization
         
     Returns:
         A list of Slack blocks
     """
-    blocks = [
-        {
-            "type": "header",
-            "text": {
-                "type": "plain_text",
-                "text": "Suggested Workloads for Optimization",
-                "emoji": True
-            }
-        },
-        {
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": "Here are some workloads that could benefit from resource optimization:"
-            }
-        },
-        {
-            "type": "divider"
-        }
-    ]
+    return list(iter_workload_suggestion_blocks(candidates))
+
+def build_workload_suggestion_blocks_json(candidates: Iterable[Dict[str, Any]]) -> str:
+    """
+    Build Slack blocks for displaying workload optimization suggestions as a
+    JSON string.
     
-    # Add each candidate as a section with a button
-    for candidate in candidates:
-        namespace = candidate.get("namespace", "default")
-        workload_name = candidate.get("workload_name", "")
-        current_resources = candidate.get("current_resources", {})
-        recommended_resources = candidate.get("recommended_resources", {})
-        justification = candidate.get("justification", "")
-        priority = candidate.get("priority", "MEDIUM")
-        potential_savings = candidate.get("potential_savings", "")
-        
-        # Format the resources comparison
-        resources_text = ""
-        if current_resources and recommended_resources:
-            resources_text = "*Current vs. Recommended Resources*\n"
-            resources_text += f"CPU Request: {current_resources.get('cpu_request', 'N/A')} → {recommended_resources.get('cpu_request', 'N/A')}\n"
-            resources_text += f"CPU Limit: {current_resources.get('cpu_limit', 'N/A')} → {recommended_resources.get('cpu_limit', 'N/A')}\n"
-            resources_text += f"Memory Request: {current_resources.get('memory_request', 'N/A')} → {recommended_resources.get('memory_request', 'N/A')}\n"
-            resources_text += f"Memory Limit: {current_resources.get('memory_limit', 'N/A')} → {recommended_resources.get('memory_limit', 'N/A')}"
+    The result can be passed as `blocks` to chat.postMessage, which sends it
+    as is instead of encoding the block list again.
+    
+    Args:
+        candidates: The workload candidates for optimization
         
-        # Add the candidate section
-        blocks.append({
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": f"*{namespace}/{workload_name}*\n"
-                       f"{resources_text}\n\n"
-                       f"*Justification*: {justification}\n"
-                       f"*Priority*: {priority}\n"
-                       f"*Potential Savings*: {potential_savings}"
-            },
-            "accessory": {
-                "type": "button",
-                "text": {
-                    "type": "plain_text",
-                    "text": "Optimize",
-                    "emoji": True
-                },
-                "value": json.dumps({
-                    "namespace": namespace,
-                    "workload": workload_name
-                }),
-                "action_id": "optimize_workload_btn"
-            }
-        })
+    Returns:
+        The Slack blocks as a JSON array string
+    """
+    return _dumps(build_workload_suggestion_blocks(candidates))
+
+def iter_workload_suggestion_blocks(candidates: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """
+    Yield Slack blocks for displaying workload optimization suggestions.
+    
+    Blocks are produced as candidates are consumed, so a streaming consumer
+    never holds every candidate's blocks at once.
+    
+    Args:
+        candidates: The workload candidates for optimization
         
-        blocks.append({
-            "type": "divider"
-        })
+    Yields:
+        Slack blocks
+    """
+    yield _SUGGESTION_HEADER
+    yield _SUGGESTION_INTRO
+    yield _DIVIDER
     
-    return blocks
+    # Add each candidate as a section with a button, stopping at Slack's
+    # block limit
+    for shown, candidate in enumerate(candidates):
+        if shown == MAX_SUGGESTIONS:
+            yield _SUGGESTIONS_TRUNCATED
+            return
+        yield _candidate_section(candidate)
+        yield _DIVIDER
+
+def _format_resources(current: Optional[Dict[str, Any]], recommended: Optional[Dict[str, Any]]) -> str:
+    """Format the current vs. recommended resources, or "" if either side is missing"""
+    if not (current and recommended):
+        return ""
+    
+    try:
+        return (
+            "*Current vs. Recommended Resources*\n"
+            f"CPU Request: {current['cpu_request']} → {recommended['cpu_request']}\n"
+            f"CPU Limit: {current['cpu_limit']} → {recommended['cpu_limit']}\n"
+            f"Memory Request: {current['memory_request']} → {recommended['memory_request']}\n"
+            f"Memory Limit: {current['memory_limit']} → {recommended['memory_limit']}"
+        )
+    except KeyError:
+        # Partial resources; show what is known
+        cur = current.get
+        rec = recommended.get
+        return (
+            "*Current vs. Recommended Resources*\n"
+            f"CPU Request: {cur('cpu_request', 'N/A')} → {rec('cpu_request', 'N/A')}\n"
+            f"CPU Limit: {cur('cpu_limit', 'N/A')} → {rec('cpu_limit', 'N/A')}\n"
+            f"Memory Request: {cur('memory_request', 'N/A')} → {rec('memory_request', 'N/A')}\n"
+            f"Memory Limit: {cur('memory_limit', 'N/A')} → {rec('memory_limit', 'N/A')}"
+        )
+
+def _candidate_section(candidate: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the section block for one optimization candidate"""
+    get = candidate.get
+    namespace = get("namespace", "default")
+    workload_name = get("workload_name", "")
+    justification = get("justification", "")
+    priority = get("priority", "MEDIUM")
+    potential_savings = get("potential_savings", "")
+    
+    resources_text = _format_resources(
+        get("current_resources"),
+        get("recommended_resources")
+    )
+    
+    return {
+        "type": "section",
+        "text": {
+            "type": "mrkdwn",
+            "text": f"*{namespace}/{workload_name}*\n"
+                   f"{resources_text}\n\n"
+                   f"*Justification*: {justification}\n"
+                   f"*Priority*: {priority}\n"
+                   f"*Potential Savings*: {potential_savings}"
+        },
+        "accessory": {
+            **_OPTIMIZE_BUTTON,
+            "value": _dumps({
+                "namespace": namespace,
+                "workload": workload_name
+            })
+        }
+    }
 
 def build_resource_modification_modal_blocks(
     namespace: str,
@@ -338,15 +525,34 @@ def build_resource_modification_modal_blocks(
         A list of Slack blocks
     """
     # Extract current resources
-    resources = workload_details.get("resources", {})
-    requests = resources.get("requests", {})
-    limits = resources.get("limits", {})
+    resources = workload_details.get("resources") or _EMPTY
+    requests = (resources.get("requests") or _EMPTY).get
+    limits = (resources.get("limits") or _EMPTY).get
     
-    cpu_request = requests.get("cpu", "0")
-    cpu_limit = limits.get("cpu", "0")
-    memory_request = requests.get("memory", "0")
-    memory_limit = limits.get("memory", "0")
+    return list(_build_resource_modification_modal_blocks(
+        namespace,
+        workload_name,
+        requests("cpu", "0"),
+        limits("cpu", "0"),
+        requests("memory", "0"),
+        limits("memory", "0")
+    ))
+
+@functools.lru_cache(maxsize=1024)
+def _build_resource_modification_modal_blocks(
+    namespace: str,
+    workload_name: str,
+    cpu_request: str,
+    cpu_limit: str,
+    memory_request: str,
+    memory_limit: str
+) -> Tuple[Dict[str, Any], ...]:
+    """
+    Build the resource modification modal blocks from the current resource values.
     
+    Cached like `_build_optimization_request_blocks`; the returned blocks are
+    shared and must not be modified.
+    """
     blocks = [
         {
             "type": "section",
@@ -355,95 +561,27 @@ def build_resource_modification_modal_blocks(
                 "text": f"Modify resource requests and limits for *{namespace}/{workload_name}*"
             }
         },
-        {
-            "type": "divider"
-        },
+        _DIVIDER,
         {
             "type": "section",
             "text": {
                 "type": "mrkdwn",
-                "text": "*Current Resources*\n"
-                       f"CPU Request: {cpu_request}\n"
-                       f"CPU Limit: {cpu_limit}\n"
-                       f"Memory Request: {memory_request}\n"
-                       f"Memory Limit: {memory_limit}"
-            }
-        },
-        {
-            "type": "input",
-            "block_id": "cpu_request_block",
-            "element": {
-                "type": "plain_text_input",
-                "action_id": "cpu_request",
-                "initial_value": cpu_request,
-                "placeholder": {
-                    "type": "plain_text",
-                    "text": "e.g., 100m, 0.5"
-                }
-            },
-            "label": {
-                "type": "plain_text",
-                "text": "CPU Request",
-                "emoji": True
+                "text": "\n".join((
+                    "*Current Resources*",
+                    f"CPU Request: {cpu_request}",
+                    f"CPU Limit: {cpu_limit}",
+                    f"Memory Request: {memory_request}",
+                    f"Memory Limit: {memory_limit}"
+                ))
             }
         },
-        {
-            "type": "input",
-            "block_id": "cpu_limit_block",
-            "element": {
-                "type": "plain_text_input",
-                "action_id": "cpu_limit",
-                "initial_value": cpu_limit,
-                "placeholder": {
-                    "type": "plain_text",
-                    "text": "e.g., 200m, 1"
-                }
-            },
-            "label": {
-                "type": "plain_text",
-                "text": "CPU Limit",
-                "emoji": True
-            }
-        },
-        {
-            "type": "input",
-            "block_id": "memory_request_block",
-            "element": {
-                "type": "plain_text_input",
-                "action_id": "memory_request",
-                "initial_value": memory_request,
-                "placeholder": {
-                    "type": "plain_text",
-                    "text": "e.g., 256Mi, 1Gi"
-                }
-            },
-            "label": {
-                "type": "plain_text",
-                "text": "Memory Request",
-                "emoji": True
-            }
-        },
-        {
-            "type": "input",
-            "block_id": "memory_limit_block",
-            "element": {
-                "type": "plain_text_input",
-                "action_id": "memory_limit",
-                "initial_value": memory_limit,
-                "placeholder": {
-                    "type": "plain_text",
-                    "text": "e.g., 512Mi, 2Gi"
-                }
-            },
-            "label": {
-                "type": "plain_text",
-                "text": "Memory Limit",
-                "emoji": True
-            }
-        }
+        _make_input("cpu_request_block", "cpu_request", cpu_request, "e.g., 100m, 0.5", "CPU Request"),
+        _make_input("cpu_limit_block", "cpu_limit", cpu_limit, "e.g., 200m, 1", "CPU Limit"),
+        _make_input("memory_request_block", "memory_request", memory_request, "e.g., 256Mi, 1Gi", "Memory Request"),
+        _make_input("memory_limit_block", "memory_limit", memory_limit, "e.g., 512Mi, 2Gi", "Memory Limit")
     ]
     
-    return blocks
+    return tuple(blocks)
 
 def build_confirmation_modal_blocks(
     namespace: str,
@@ -473,34 +611,34 @@ def build_confirmation_modal_blocks(
                 "text": f"You are about to modify resources for *{namespace}/{workload_name}*. Please review the changes."
             }
         },
-        {
-            "type": "divider"
-        },
+        _DIVIDER,
         {
             "type": "section",
             "text": {
                 "type": "mrkdwn",
-                "text": "*Current Resources*\n"
-                       f"CPU Request: {current_resources['requests']['cpu']}\n"
-                       f"CPU Limit: {current_resources['limits']['cpu']}\n"
-                       f"Memory Request: {current_resources['requests']['memory']}\n"
-                       f"Memory Limit: {current_resources['limits']['memory']}"
+                "text": "\n".join((
+                    "*Current Resources*",
+                    f"CPU Request: {current_resources['requests']['cpu']}",
+                    f"CPU Limit: {current_resources['limits']['cpu']}",
+                    f"Memory Request: {current_resources['requests']['memory']}",
+                    f"Memory Limit: {current_resources['limits']['memory']}"
+                ))
             }
         },
         {
             "type": "section",
             "text": {
                 "type": "mrkdwn",
-                "text": "*New Resources*\n"
-                       f"CPU Request: {new_resources['cpu_request']}\n"
-                       f"CPU Limit: {new_resources['cpu_limit']}\n"
-                       f"Memory Request: {new_resources['memory_request']}\n"
-                       f"Memory Limit: {new_resources['memory_limit']}"
+                "text": "\n".join((
+                    "*New Resources*",
+                    f"CPU Request: {new_resources['cpu_request']}",
+                    f"CPU Limit: {new_resources['cpu_limit']}",
+                    f"Memory Request: {new_resources['memory_request']}",
+                    f"Memory Limit: {new_resources['memory_limit']}"
+                ))
             }
         },
-        {
-            "type": "divider"
-        },
+        _DIVIDER,
         {
             "type": "section",
             "text": {